@@ -3,86 +3,264 @@
 Lightweight analytics logging for JAIMES conversations.
 Stores generic events in a local SQLite DB for reporting and KPIs.
 """
+import asyncio
+import atexit
 import sqlite3
 import json
 import logging
+import os
+import threading
+import time
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_DB_PATH = "conversation_analytics.db"
 
+# One long-lived connection per (thread, db_path); sqlite3 connections are not
+# shareable across threads by default.
+_local = threading.local()
+
+
+def _get_connection(db_path: str) -> sqlite3.Connection:
+    """Return this thread's connection to db_path, opening and tuning it once."""
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path)
+        # WAL lets readers run alongside the writer, and NORMAL sync only
+        # fsyncs at checkpoints instead of on every commit.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # Keep sort/temp b-trees in memory and allow up to a 64 MB page cache.
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")
+        connections[db_path] = conn
+    return conn
+
+
+# Events are buffered and written in one transaction once the batch fills up or
+# the previous flush is older than the interval, so bursts share a commit while
+# an isolated event is still written straight away. Events buffered in between
+# get a flush deadline, so nothing waits longer than the interval.
+EVENT_BATCH_SIZE = 50
+EVENT_FLUSH_INTERVAL_SECONDS = 1.0
+
+_pending_events: Dict[str, List[Tuple[str, str, str, str]]] = {}
+_last_flush: Dict[str, float] = {}
+_pending_lock = threading.Lock()
+
+# Deferred flushes (deadlines, and flushes requested from async code) all run
+# on one long-lived daemon thread, so they reuse its cached connection instead
+# of opening and tuning a new one per burst.
+_flush_deadlines: Dict[str, float] = {}
+_flush_wakeup = threading.Condition(_pending_lock)
+_flusher_thread: Optional[threading.Thread] = None
+
+# Running row counts per db_path, seeded by init_analytics_db and bumped on each
+# flush, so get_event_count doesn't scan the whole table.
+_event_counts: Dict[str, int] = {}
+
+# Error from the most recent failed flush per db_path, cleared by the next
+# successful one; surfaced by probe_analytics_db for health checks.
+_last_flush_errors: Dict[str, str] = {}
+
+
+def flush_events(db_path: str = DEFAULT_DB_PATH) -> None:
+    """Write any buffered events for db_path in a single transaction."""
+    with _pending_lock:
+        rows = _pending_events.pop(db_path, None)
+        _last_flush[db_path] = time.monotonic()
+        _flush_deadlines.pop(db_path, None)
+    if not rows:
+        return
+    try:
+        conn = _get_connection(db_path)
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO events (event_name, session_id, timestamp, payload_json)
+                VALUES (?, ?, ?, ?)
+                """,
+                rows,
+            )
+        with _pending_lock:
+            if db_path in _event_counts:
+                _event_counts[db_path] += len(rows)
+            _last_flush_errors.pop(db_path, None)
+    except Exception as e:
+        with _pending_lock:
+            _last_flush_errors[db_path] = str(e)
+        logger.error(f"Failed to flush {len(rows)} analytics events: {e}")
+
+
+def _flusher_loop() -> None:
+    """Body of the flusher thread: flushes each db_path once its deadline passes."""
+    while True:
+        with _flush_wakeup:
+            while True:
+                now = time.monotonic()
+                due = [path for path, deadline in _flush_deadlines.items() if deadline <= now]
+                if due:
+                    break
+                timeout = min(_flush_deadlines.values()) - now if _flush_deadlines else None
+                _flush_wakeup.wait(timeout)
+        for db_path in due:
+            flush_events(db_path)
+
+
+def _schedule_flush(db_path: str, deadline: float) -> None:
+    """Asks the flusher thread to flush db_path by deadline; hold _pending_lock."""
+    global _flusher_thread
+    current = _flush_deadlines.get(db_path)
+    if current is not None and current <= deadline:
+        return
+    _flush_deadlines[db_path] = deadline
+    if _flusher_thread is None or not _flusher_thread.is_alive():
+        _flusher_thread = threading.Thread(
+            target=_flusher_loop, name="analytics-flusher", daemon=True
+        )
+        _flusher_thread.start()
+    _flush_wakeup.notify()
+
+
+def flush_all_events() -> None:
+    """Write buffered events for every db_path; call on shutdown."""
+    for db_path in list(_pending_events):
+        flush_events(db_path)
+
+
+atexit.register(flush_all_events)
+
 
 def init_analytics_db(db_path: str = DEFAULT_DB_PATH) -> None:
     """Initialize the analytics database if it doesn't exist."""
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        conn = _get_connection(db_path)
+        # sqlite3 doesn't open a transaction for DDL on its own; start one so the
+        # table and both indexes are created under a single commit.
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    event_name TEXT NOT NULL,
+                    session_id TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    payload_json TEXT NOT NULL
+                )
             """
-            CREATE TABLE IF NOT EXISTS events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                event_name TEXT NOT NULL,
-                session_id TEXT NOT NULL,
-                timestamp TEXT NOT NULL,
-                payload_json TEXT NOT NULL
             )
-        """
-        )
-        cursor.execute(
-            """
-            CREATE INDEX IF NOT EXISTS idx_events_name_time
-                ON events(event_name, timestamp)
-            """
-        )
-        cursor.execute(
-            """
-            CREATE INDEX IF NOT EXISTS idx_events_session
-                ON events(session_id)
-            """
-        )
-        conn.commit()
-        conn.close()
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_events_name_time
+                    ON events(event_name, timestamp)
+                """
+            )
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_events_session
+                    ON events(session_id)
+                """
+            )
+        count = conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+        with _pending_lock:
+            _event_counts[db_path] = count
         logger.info("Analytics DB initialized")
     except Exception as e:
         logger.error(f"Failed to initialize analytics DB: {e}")
 
 
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
 def log_event(
     event_name: str,
     session_id: str,
     payload: Optional[Dict[str, Any]] = None,
     db_path: str = DEFAULT_DB_PATH,
 ) -> None:
-    """Insert a generic analytics event with a JSON payload."""
+    """Record a generic analytics event with a JSON payload.
+
+    Events are buffered and flushed in batches (on the flusher thread when
+    called from a running event loop), at most EVENT_FLUSH_INTERVAL_SECONDS after they
+    were logged; call flush_events() to force pending events to disk.
+    """
     try:
         if payload is None:
             payload = {}
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO events (event_name, session_id, timestamp, payload_json)
-            VALUES (?, ?, ?, ?)
-            """,
-            (
-                event_name,
-                session_id,
-                datetime.utcnow().isoformat(timespec="seconds"),
-                json.dumps(payload, ensure_ascii=False),
-            ),
+        row = (
+            event_name,
+            session_id,
+            datetime.utcnow().isoformat(timespec="seconds"),
+            json.dumps(payload, ensure_ascii=False),
         )
-        conn.commit()
-        conn.close()
+        with _pending_lock:
+            pending = _pending_events.setdefault(db_path, [])
+            pending.append(row)
+            since_flush = time.monotonic() - _last_flush.get(db_path, 0.0)
+            flush_due = (
+                len(pending) >= EVENT_BATCH_SIZE
+                or since_flush >= EVENT_FLUSH_INTERVAL_SECONDS
+            )
+            now = time.monotonic()
+            if not flush_due:
+                _schedule_flush(db_path, now + EVENT_FLUSH_INTERVAL_SECONDS - since_flush)
+            elif _in_event_loop():
+                # Called from async code: commit on the flusher thread so the
+                # SQLite write never blocks the event loop.
+                _schedule_flush(db_path, now)
+                flush_due = False
+        if flush_due:
+            flush_events(db_path)
     except Exception as e:
         logger.error(f"Failed to log event '{event_name}' for session {session_id}: {e}")
 
 
+def get_event_count(db_path: str = DEFAULT_DB_PATH) -> int:
+    """Return the number of events written to db_path (buffered events excluded).
+
+    O(1) once init_analytics_db has run in this process; falls back to a
+    COUNT(*) query otherwise.
+    """
+    with _pending_lock:
+        count = _event_counts.get(db_path)
+    if count is not None:
+        return count
+    conn = _get_connection(db_path)
+    return conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+
+def probe_analytics_db(db_path: str = DEFAULT_DB_PATH) -> int:
+    """Check that db_path is usable and return its event count.
+
+    Raises if the file is gone, the events table can't be read through this
+    thread's shared connection, or the last flush failed.
+    """
+    with _pending_lock:
+        flush_error = _last_flush_errors.get(db_path)
+    if flush_error is not None:
+        raise sqlite3.OperationalError(f"Last analytics flush failed: {flush_error}")
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Analytics database {db_path} is missing")
+    conn = _get_connection(db_path)
+    conn.execute("SELECT 1 FROM events LIMIT 1").fetchall()
+    return get_event_count(db_path)
+
+
 def ensure_leads_table(db_path: str = DEFAULT_DB_PATH) -> None:
     """Create a simple leads table for booking/consult requests (no PHI)."""
     try:
-        conn = sqlite3.connect(db_path)
+        conn = _get_connection(db_path)
         cur = conn.cursor()
         cur.execute(
             """
@@ -99,7 +277,6 @@ def ensure_leads_table(db_path: str = DEFAULT_DB_PATH) -> None:
         """
         )
         conn.commit()
-        conn.close()
     except Exception as e:
         logger.error(f"Failed to init leads table: {e}")
 
@@ -115,24 +292,24 @@ def save_lead(
 ) -> None:
     """Persist a lightweight lead/booking request record (avoid storing PHI)."""
     try:
-        conn = sqlite3.connect(db_path)
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO leads (session_id, timestamp, name, phone, service_slug, preferred_time, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                session_id,
-                datetime.utcnow().isoformat(timespec="seconds"),
-                name,
-                phone,
-                service_slug,
-                preferred_time,
-                notes,
-            ),
-        )
-        conn.commit()
-        conn.close()
+        conn = _get_connection(db_path)
+        # The connection is long-lived, so roll back on failure rather than
+        # leave a half-open transaction behind for the next write.
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO leads (session_id, timestamp, name, phone, service_slug, preferred_time, notes)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    session_id,
+                    datetime.utcnow().isoformat(timespec="seconds"),
+                    name,
+                    phone,
+                    service_slug,
+                    preferred_time,
+                    notes,
+                ),
+            )
     except Exception as e:
         logger.error(f"Failed to save lead for session {session_id}: {e}")
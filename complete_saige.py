@@ -3,8 +3,10 @@
 import asyncio
 import re
 import html
+import time
+from functools import lru_cache
 from datetime import datetime, timezone
-from typing import AsyncGenerator, Dict, Optional
+from typing import Any, AsyncGenerator, Dict, List, Optional
 
 from pydantic import BaseModel, Field, validator
 from enhanced_accent_handler import SouthernAccentHandler
@@ -15,9 +17,9 @@ from booking_adapter import BookingAdapter
 from models import ConversationState, SAIGESession, CustomerProfile, ChatMessage
 from mock_db import MockCustomerEngine
 from circuitbreaker import circuit
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from tenacity import retry, stop_after_attempt, wait_random_exponential, retry_if_exception, retry_if_exception_type
 from config import config
-from groq import AsyncGroq
+from groq import APIStatusError, AsyncGroq
 import redis
 from analytics import init_analytics_db, log_event, ensure_leads_table
 import structlog
@@ -43,6 +45,17 @@ structlog.configure(
 
 logger = structlog.get_logger(__name__)
 
+_NON_DIGIT_RE = re.compile(r"\D")
+_INPUT_WHITESPACE_RE = re.compile(r"\s+")
+# Injection patterns rejected in user input, as one case-insensitive scan
+_DANGEROUS_INPUT_RE = re.compile(
+    r"<script|javascript:|vbscript:|onload=|onerror="
+    r"|eval\(|exec\(|system\(|import\s+os|__import__",
+    re.IGNORECASE,
+)
+# Session ID should be alphanumeric with hyphens/underscores only
+_SESSION_ID_RE = re.compile(r"[a-zA-Z0-9\-_]+")
+
 # Input validation models
 class UserInputValidator(BaseModel):
     """Validates and sanitizes user input"""
@@ -58,24 +71,17 @@ class UserInputValidator(BaseModel):
         sanitized = html.escape(v.strip())
         
         # Remove excessive whitespace
-        sanitized = re.sub(r'\s+', ' ', sanitized)
+        sanitized = _INPUT_WHITESPACE_RE.sub(' ', sanitized)
         
         # Block potential injection patterns
-        dangerous_patterns = [
-            r'<script', r'javascript:', r'vbscript:', r'onload=', r'onerror=',
-            r'eval\(', r'exec\(', r'system\(', r'import\s+os', r'__import__'
-        ]
-        
-        for pattern in dangerous_patterns:
-            if re.search(pattern, sanitized, re.IGNORECASE):
-                raise ValueError("Input contains potentially dangerous content")
+        if _DANGEROUS_INPUT_RE.search(sanitized):
+            raise ValueError("Input contains potentially dangerous content")
         
         return sanitized
     
     @validator('session_id')
     def validate_session_id(cls, v):
-        # Session ID should be alphanumeric with hyphens only
-        if not re.match(r'^[a-zA-Z0-9\-_]+$', v):
+        if not _SESSION_ID_RE.fullmatch(v):
             raise ValueError("Invalid session ID format")
         return v
 
@@ -86,7 +92,7 @@ class PhoneNumberValidator(BaseModel):
     @validator('phone')
     def validate_phone(cls, v):
         # Remove all non-digit characters for validation
-        digits_only = re.sub(r'\D', '', v)
+        digits_only = _NON_DIGIT_RE.sub('', v)
         
         # US phone numbers should be 10 or 11 digits
         if len(digits_only) not in [10, 11]:
@@ -107,26 +113,51 @@ def redis_circuit_breaker():
     """Circuit breaker for Redis operations"""
     return circuit(failure_threshold=3, recovery_timeout=10, expected_exception=Exception)
 
+def _is_retryable_groq_error(exc: BaseException) -> bool:
+    """Client errors (4xx) won't succeed on retry, except timeouts and rate limits"""
+    if isinstance(exc, APIStatusError):
+        return exc.status_code in (408, 429) or exc.status_code >= 500
+    return True
+
 def groq_retry():
-    """Retry logic for Groq API with exponential backoff"""
+    """Retry logic for Groq API with jittered exponential backoff.
+
+    Apply to a coroutine that opens the request, not to a streaming async
+    generator: calling a generator never raises, so nothing would be retried.
+    """
     return retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        retry=retry_if_exception_type((ConnectionError, TimeoutError, Exception))
+        wait=wait_random_exponential(multiplier=1, max=10),
+        retry=retry_if_exception(_is_retryable_groq_error),
+        reraise=True,
     )
 
 def redis_retry():
     """Retry logic for Redis operations"""
     return retry(
         stop=stop_after_attempt(2),
-        wait=wait_exponential(multiplier=0.5, min=0.5, max=5),
+        wait=wait_random_exponential(multiplier=0.5, max=5),
         retry=retry_if_exception_type((ConnectionError, TimeoutError))
     )
 
 
+# Keyword scans used by the state machine, compiled once so each turn is a
+# single case-insensitive pass instead of a lower() copy plus N substring checks.
+_AFFIRMATION_RE = re.compile(r"yes|yeah|yep|correct", re.IGNORECASE)
+_RETURNING_RE = re.compile(r"yes|yeah|yep", re.IGNORECASE)
+_GREETING_RE = re.compile(r"hi|hello|hey", re.IGNORECASE)
+_DECLINE_RE = re.compile(r"no|don't have it|not right now", re.IGNORECASE)
+
+# Sessions live this long in Redis; the in-memory fallback expires them on the
+# same schedule, swept at most once per purge interval.
+_SESSION_TTL_SECONDS = 3600
+_MEMORY_SESSION_PURGE_INTERVAL_SECONDS = 60
+
+
+@lru_cache(maxsize=4096)
 def normalize_phone_number(phone: str) -> str:
     """Strips all non-digit characters and the leading '1' if it's a US number."""
-    digits_only = re.sub(r"\D", "", phone)
+    digits_only = _NON_DIGIT_RE.sub("", phone)
     if len(digits_only) == 11 and digits_only.startswith("1"):
         return digits_only[1:]
     return digits_only
@@ -142,6 +173,9 @@ class CompleteSAIGESystem:
         self.redis_client = None
         logger.info("Redis connection will be established on first use.")
         self.in_memory_sessions: Dict[str, SAIGESession] = {}
+        # session_id -> monotonic expiry for sessions held in memory
+        self._in_memory_expiry: Dict[str, float] = {}
+        self._next_memory_purge = 0.0
 
         # Initialize analytics DB and leads table (HIPAA-safe metadata only)
         init_analytics_db()
@@ -190,7 +224,8 @@ class CompleteSAIGESystem:
     def get_session(self, session_id: str) -> Optional[SAIGESession]:
         self._ensure_redis_connection()
         try:
-            if self.redis_client and self.redis_client.ping():
+            # No ping() first: a dead connection raises on the GET itself
+            if self.redis_client:
                 session_json = self.redis_client.get(session_id)
                 if session_json:
                     return SAIGESession.model_validate_json(session_json)
@@ -198,23 +233,48 @@ class CompleteSAIGESystem:
             logger.warning(f"Redis connection/timeout error on GET: {e}. Falling back to memory.")
         except Exception as e:
             logger.warning(f"Redis error on GET session {session_id}: {e}. Falling back to memory.")
+        expires_at = self._in_memory_expiry.get(session_id)
+        if expires_at is not None and expires_at <= time.monotonic():
+            # Past its TTL but not yet swept by the periodic purge
+            self.in_memory_sessions.pop(session_id, None)
+            self._in_memory_expiry.pop(session_id, None)
+            return None
         return self.in_memory_sessions.get(session_id)
 
     @redis_circuit_breaker()
     @redis_retry()
     def save_session(self, session_id: str, session: SAIGESession):
         self._ensure_redis_connection()
+        # Sweep on every save path, so stale fallback sessions are also dropped
+        # once Redis is back and no further saves land in memory.
+        now = time.monotonic()
+        if now >= self._next_memory_purge:
+            self._purge_expired_memory_sessions(now)
         try:
-            if self.redis_client and self.redis_client.ping():
-                self.redis_client.set(session_id, session.model_dump_json(), ex=3600)
-                if session_id in self.in_memory_sessions:
-                    del self.in_memory_sessions[session_id]
+            if self.redis_client:
+                self.redis_client.set(
+                    session_id, session.model_dump_json(), ex=_SESSION_TTL_SECONDS
+                )
+                self.in_memory_sessions.pop(session_id, None)
+                self._in_memory_expiry.pop(session_id, None)
                 return
         except (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError) as e:
             logger.warning(f"Redis connection/timeout error on SET: {e}. Falling back to memory.")
         except Exception as e:
             logger.warning(f"Redis error on SET session {session_id}: {e}. Falling back to memory.")
         self.in_memory_sessions[session_id] = session
+        self._in_memory_expiry[session_id] = now + _SESSION_TTL_SECONDS
+
+    def _purge_expired_memory_sessions(self, now: float):
+        """Drops in-memory fallback sessions past their TTL in one sweep."""
+        self._next_memory_purge = now + _MEMORY_SESSION_PURGE_INTERVAL_SECONDS
+        # Snapshot first: saves may run concurrently in worker threads
+        expired = [sid for sid, expires_at in list(self._in_memory_expiry.items()) if expires_at <= now]
+        for sid in expired:
+            self.in_memory_sessions.pop(sid, None)
+            self._in_memory_expiry.pop(sid, None)
+        if expired:
+            logger.info(f"Purged {len(expired)} expired in-memory sessions.")
 
     async def start_conversation(
         self, caller_phone: str, session_id: str
@@ -257,7 +317,8 @@ class CompleteSAIGESystem:
             log_event("call_started", session_id, {"user_type": "returning" if customer_profile else "new"})
         except Exception as e:
             logger.warning(f"Analytics logging (call_started) failed: {e}")
-        self.save_session(session_id, session)
+        # Blocking Redis I/O runs in a worker thread so the event loop stays free
+        await asyncio.to_thread(self.save_session, session_id, session)
         async for chunk in self.process_conversation(
             user_input="<BEGIN_CONVERSATION>", session_id=session_id
         ):
@@ -298,13 +359,13 @@ Conversation rules:
 
         if state == ConversationState.CUSTOMER_VERIFICATION:
             customer_name = session.customer_profile.name if session.customer_profile else "our customer"
-            user_affirmed = any(word in user_input.lower() for word in ['yes', 'yeah', 'yep', 'correct'])
+            user_affirmed = _AFFIRMATION_RE.search(user_input) is not None
             if user_input == "<BEGIN_CONVERSATION>":
                 mission = f"Say this exactly: 'Hi, this is {config.assistant_name}, your {config.assistant_title} with {config.shop_name}. I see this number is for {customer_name}. Am I speaking with the right person?'"
             elif user_affirmed:
                 next_state = ConversationState.VEHICLE_CONFIRMATION
                 if session.customer_profile and session.customer_profile.service_history:
-                    last_service = sorted(session.customer_profile.service_history, key=lambda s: s.service_date, reverse=True)[0]
+                    last_service = max(session.customer_profile.service_history, key=lambda s: s.service_date)
                     mission = (f"Say this, or something very close to: 'Great, thanks for confirming. I see the last time you were in, you were in for {last_service.service_description} "
                             f"on your {last_service.vehicle_description}. How has that been for you?'")
                 else:
@@ -316,7 +377,7 @@ Conversation rules:
         elif state == ConversationState.PRIOR_SERVICE_CONFIRMATION:
             if user_input == "<BEGIN_CONVERSATION>":
                 mission = f"Say this exactly: 'Hi, this is {config.assistant_name}, your {config.assistant_title} with {config.shop_name}. To get things started, have you visited us here before?'"
-            elif any(word in user_input.lower() for word in ['yes', 'yeah', 'yep']):
+            elif _RETURNING_RE.search(user_input):
                 next_state = ConversationState.PHONE_NUMBER_CLARIFICATION
                 mission = "The user is a returning customer. Say this exactly: 'Okay, thanks for clarifying. What phone number might the account be under?'"
             else:
@@ -342,7 +403,7 @@ Conversation rules:
         # --- CHAPTER 2: MED-SPA ONBOARDING ---
 
             acknowledgement = "Great, thanks for that information. "
-            if any(word in user_input.lower() for word in ["no", "don't have it", "not right now"]):
+            if _DECLINE_RE.search(user_input):
                 acknowledgement = "No problem at all. "
 
             probable_cause = session.temp_data.get('probable_cause', 'Brake Pad Replacement')
@@ -446,7 +507,7 @@ Conversation rules:
             # Conversation is already finished, provide brief acknowledgment only
             if 'thank you' in user_input.lower():
                 mission = "You're welcome. Take care."
-            elif any(greeting in user_input.lower() for greeting in ['hi', 'hello', 'hey']):
+            elif _GREETING_RE.search(user_input):
                 mission = "Hi again. If you need anything else, feel free to call back."
             else:
                 mission = f"Thanks for calling {config.shop_name}."
@@ -501,8 +562,14 @@ Conversation rules:
 
     # Removed automotive cheat sheet logic
 
-    @groq_circuit_breaker()
     @groq_retry()
+    async def _open_llm_stream(self, llm_messages: List[Dict[str, Any]]):
+        """Starts a streaming completion, retrying failures before the first chunk"""
+        return await self.groq_client.chat.completions.create(
+            messages=llm_messages, model=self.groq_model, stream=True
+        )
+
+    @groq_circuit_breaker()
     async def _call_llm_and_stream(
         self, system_prompt: str, session: SAIGESession
     ) -> AsyncGenerator[str, None]:
@@ -512,9 +579,7 @@ Conversation rules:
         full_response_for_history = ""
         try:
             logger.info(f"Making LLM call for session {session.session_id}")
-            chat_completion_stream = await self.groq_client.chat.completions.create(
-                messages=llm_messages, model=self.groq_model, stream=True
-            )
+            chat_completion_stream = await self._open_llm_stream(llm_messages)
             async for chunk in chat_completion_stream:
                 content = chunk.choices[0].delta.content
                 if content:
@@ -535,7 +600,6 @@ Conversation rules:
             yield error_message
 
     @groq_circuit_breaker()
-    @groq_retry()
     async def _call_llm_and_stream_enhanced(
         self, system_prompt: str, session: SAIGESession, streaming_mode: StreamingMode, session_id: str
     ) -> AsyncGenerator[str, None]:
@@ -549,9 +613,7 @@ Conversation rules:
             # Get streaming configuration for the mode
             config = self.streaming_manager.configs.get(streaming_mode, self.streaming_manager.configs[StreamingMode.INFORMATION])
             
-            chat_completion_stream = await self.groq_client.chat.completions.create(
-                messages=llm_messages, model=self.groq_model, stream=True
-            )
+            chat_completion_stream = await self._open_llm_stream(llm_messages)
             
             word_buffer = ""
             async for chunk in chat_completion_stream:
@@ -604,7 +666,7 @@ Conversation rules:
                     role="assistant", content=full_response_for_history
                 ).model_dump()
             )
-            self.save_session(session.session_id, session)
+            await asyncio.to_thread(self.save_session, session.session_id, session)
         except Exception as e:
             logger.error(f"Error saving session {session.session_id}: {e}", exc_info=True)
 
@@ -653,7 +715,7 @@ Conversation rules:
         
         # Enhanced error handling for session retrieval
         try:
-            current_session = self.get_session(session_id)
+            current_session = await asyncio.to_thread(self.get_session, session_id)
             if not current_session:
                 logger.error(f"Session {session_id} not found")
                 yield "I seem to have lost our connection, please call back."
@@ -19,6 +19,9 @@ import structlog
 
 logger = structlog.get_logger(__name__)
 
+_NON_DIGIT_RE = re.compile(r'\D')
+_NAME_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
 # Mock customer data for development/testing
 MOCK_CUSTOMERS = {
     "1234567890": {
@@ -77,6 +80,14 @@ class MockCustomerEngine:
     def __init__(self):
         logger.info("MockCustomerEngine initialized with mock data")
         self.customers = MOCK_CUSTOMERS.copy()
+        # Normalize stored names once instead of on every search
+        self._normalized_names = [
+            (self._normalize_name(customer_data["name"]), customer_data)
+            for customer_data in self.customers.values()
+        ]
+        self._customers_by_name: Dict[str, Dict[str, Any]] = {}
+        for stored_name, customer_data in self._normalized_names:
+            self._customers_by_name.setdefault(stored_name, customer_data)
     
     async def find_customer_by_phone(self, phone_number: str) -> Optional[CustomerProfile]:
         """Find customer by phone number"""
@@ -88,34 +99,37 @@ class MockCustomerEngine:
     
     async def find_customer_by_name(self, name: str) -> Optional[CustomerProfile]:
         """Find customer by name"""
-        normalized_name = self._normalize_name(name)
-        for customer_data in self.customers.values():
-            if self._normalize_name(customer_data["name"]) == normalized_name:
-                return CustomerProfile(**customer_data)
+        customer_data = self._customers_by_name.get(self._normalize_name(name))
+        if customer_data is not None:
+            return CustomerProfile(**customer_data)
         return None
     
     async def search_customers_by_phone(self, phone_number: str) -> List[CustomerProfile]:
         """Search for customers by phone number (partial match)"""
         normalized_phone = self._normalize_phone(phone_number)
-        results = []
-        for phone, customer_data in self.customers.items():
-            if normalized_phone in phone or phone in normalized_phone:
-                results.append(CustomerProfile(**customer_data))
-        return results
+        return [
+            CustomerProfile(**customer_data)
+            for phone, customer_data in self.customers.items()
+            if normalized_phone in phone or phone in normalized_phone
+        ]
     
     async def search_customers_by_name(self, name: str) -> List[CustomerProfile]:
         """Search for customers by name (partial match)"""
         normalized_name = self._normalize_name(name)
-        results = []
-        for customer_data in self.customers.values():
-            if normalized_name in self._normalize_name(customer_data["name"]):
-                results.append(CustomerProfile(**customer_data))
-        return results
+        return [
+            CustomerProfile(**customer_data)
+            for stored_name, customer_data in self._normalized_names
+            if normalized_name in stored_name
+        ]
     
     def _normalize_phone(self, phone: str) -> str:
         """Normalize phone number for comparison"""
-        return re.sub(r'\D', '', phone)
+        digits = _NON_DIGIT_RE.sub('', phone)
+        # Caller IDs arrive in E.164 (+1...), stored numbers are 10-digit
+        if len(digits) == 11 and digits.startswith('1'):
+            return digits[1:]
+        return digits
     
     def _normalize_name(self, name: str) -> str:
         """Normalize name for comparison"""
-        return re.sub(r'[^\w\s]', '', name.lower()).strip()
+        return _NAME_PUNCTUATION_RE.sub('', name.lower()).strip()
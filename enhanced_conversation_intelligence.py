@@ -62,7 +62,7 @@ class PersonalityTrait(Enum):
     SOUTHERN_CHARM = "southern_charm"
 
 
-@dataclass
+@dataclass(slots=True)
 class Intent:
     """Detected customer intent with confidence and context"""
 
@@ -72,7 +72,7 @@ class Intent:
     context_clues: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class EmotionalContext:
     """Customer's emotional context and history"""
 
@@ -82,7 +82,7 @@ class EmotionalContext:
     history: List[Tuple[EmotionalState, datetime]] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationContext:
     """Complete conversation context for intelligent responses"""
 
@@ -6,8 +6,9 @@ Provides comprehensive health monitoring for all system components
 
 import asyncio
 import time
+from collections import Counter
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
 import structlog
 import redis.exceptions
@@ -21,7 +22,7 @@ class HealthStatus(Enum):
     DEGRADED = "degraded"
     UNHEALTHY = "unhealthy"
 
-@dataclass
+@dataclass(slots=True)
 class ComponentHealth:
     """Health status for individual component"""
     name: str
@@ -41,7 +42,7 @@ class ComponentHealth:
             "details": self.details or {}
         }
 
-@dataclass
+@dataclass(slots=True)
 class SystemHealth:
     """Overall system health status"""
     overall_status: HealthStatus
@@ -387,13 +388,12 @@ class HealthChecker:
         
         all_components.extend(enhanced_modules)
         
-        # Determine overall system health
-        unhealthy_count = len([c for c in all_components if c.status == HealthStatus.UNHEALTHY])
-        degraded_count = len([c for c in all_components if c.status == HealthStatus.DEGRADED])
+        # Determine overall system health (one pass tallies every status)
+        status_counts = Counter(c.status for c in all_components)
         
-        if unhealthy_count > 0:
+        if status_counts[HealthStatus.UNHEALTHY] > 0:
             overall_status = HealthStatus.UNHEALTHY
-        elif degraded_count > 0:
+        elif status_counts[HealthStatus.DEGRADED] > 0:
             overall_status = HealthStatus.DEGRADED
         else:
             overall_status = HealthStatus.HEALTHY
@@ -406,7 +406,7 @@ class HealthChecker:
         
         logger.info("Health check completed", 
                    overall_status=overall_status.value,
-                   healthy_components=len([c for c in all_components if c.status == HealthStatus.HEALTHY]),
+                   healthy_components=status_counts[HealthStatus.HEALTHY],
                    total_components=len(all_components))
         
         return system_health
@@ -2,18 +2,21 @@
 """
 SAIGE AI Executive - Main Entry Point for Render
 """
+import asyncio
 import os
+import re
+from contextlib import asynccontextmanager
 import copy  # Used by some logging, keep if needed elsewhere
 import logging
 import uuid
-import json
+import orjson
 from typing import Optional, List, Dict, Any
 from time import perf_counter
 from datetime import datetime
 
 # --- Pydantic and FastAPI Imports ---
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse, StreamingResponse  # Keep StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse  # Keep StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel  # Ensure this is imported for base classes
 
@@ -21,6 +24,7 @@ from pydantic import BaseModel  # Ensure this is imported for base classes
 from config import config  # <--- ADD THIS IMPORT
 from session_manager import SessionMonitor  # Only SessionMonitor is needed here now
 from vapi_server_client import VAPIServerClient
+from analytics import flush_all_events
 from dotenv import load_dotenv
 
 # Consolidate ALL imports from models.py into one place
@@ -33,7 +37,7 @@ from models import (
     IdentificationResult,
     VehicleInfo,
 )
-from utils import send_discord_alert  # Assuming this is used for Discord alerts
+from utils import aclose_discord_client, send_discord_alert, start_alert_worker  # Assuming this is used for Discord alerts
 
 # --- Logging Configuration ---
 logging.basicConfig(
@@ -41,6 +45,30 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# --- Pre-encoded SSE frames for the chat completions stream ---
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+_SSE_DONE = b"data: [DONE]\n\n"
+_STREAM_ERROR_MESSAGE = "I'm experiencing a temporary issue. Please try again."
+_SSE_ERROR_CHUNK = (
+    _SSE_PREFIX
+    + orjson.dumps({"choices": [{"delta": {"content": _STREAM_ERROR_MESSAGE}}]})
+    + _SSE_SUFFIX
+)
+
+# Allowed characters for /sessions/{session_id}, compiled once
+_SESSION_ID_RE = re.compile(r"[A-Za-z0-9\-_.:]+")
+
+# --- Pre-rendered static error bodies ---
+_SERVICE_UNAVAILABLE_BODY = orjson.dumps({"detail": "SAIGE system not available."})
+
+
+def _service_unavailable() -> Response:
+    """503 response for when the SAIGE system failed to initialize."""
+    return Response(
+        content=_SERVICE_UNAVAILABLE_BODY, status_code=503, media_type="application/json"
+    )
+
 # --- Pydantic Request Models (UPDATED FOR VAPI WEBHOOK EVENT STRUCTURE) ---
 # Delete your old CallDetails class definition here if it was present
 # Delete your old ChatCompletionsRequest class definition
@@ -69,7 +97,41 @@ class VapiWebhookRequest(BaseModel):
 load_dotenv()
 
 # --- FastAPI App & Services Initialization ---
-app = FastAPI(title="SAIGE - Spa AI Guest Executive", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_alert_worker()
+    yield
+    # Release pooled outbound connections on shutdown
+    await vapi_client.aclose()
+    await aclose_discord_client()
+    # Write out analytics events still waiting for their batch to fill
+    await asyncio.to_thread(flush_all_events)
+
+
+app = FastAPI(
+    title="SAIGE - Spa AI Guest Executive", version="1.0.0", lifespan=lifespan
+)
+
+class RejectWhenSaigeUnavailable:
+    """Answers 503 before the webhook body is read or validated when startup failed.
+
+    Plain ASGI rather than @app.middleware("http"), so other requests (and the
+    SSE stream) pass straight through without an extra BaseHTTPMiddleware hop.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if jaimes is None and scope["type"] == "http" and scope["path"] == "/chat/completions":
+            await _service_unavailable()(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+# Registered before CORS and security headers so those still wrap the 503
+app.add_middleware(RejectWhenSaigeUnavailable)
+
 
 # Secure CORS configuration: include both DEV and PROD origins to support tests toggling env at runtime
 allowed_origins = list({
@@ -90,7 +152,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    max_age=3600,
+    max_age=86400,
 )
 
 # Add security headers middleware
@@ -162,14 +224,14 @@ async def chat_completions(request: Request, data: VapiWebhookRequest):
         jaimes_initialized = getattr(jaimes, "is_initialized", None) is True
         # Treat JAIMES as required if no messages were provided, even in TEST
         if (jaimes is None) or ((not jaimes_initialized) and (len(data.messages) == 0 or not is_test_env)):
-            raise HTTPException(status_code=503, detail="SAIGE system not available.")
+            return _service_unavailable()
 
         # Determine Session ID
         session_id = data.call.id  # Correct, 'call' is top-level now
         if not session_id:
             session_id = str(uuid.uuid4())
-            logger.warning(f"No call ID found. Generating new UUID: {session_id}")
-        logger.info(f"Calculated session_id for this request: {session_id}")
+            logger.warning("No call ID found. Generating new UUID: %s", session_id)
+        logger.info("Calculated session_id for this request: %s", session_id)
 
         # Initialize the monitor now that we have a session_id
         monitor = SessionMonitor(session_id)
@@ -179,7 +241,7 @@ async def chat_completions(request: Request, data: VapiWebhookRequest):
             (msg.content for msg in reversed(data.messages) if msg.role == "user"),
             "Hello",
         )
-        logger.info(f"User input extracted: '{user_input}' for session: {session_id}")
+        logger.info("User input extracted: '%s' for session: %s", user_input, session_id)
 
         # ===================================================================
         # --- STREAMING RESPONSE GENERATOR ---
@@ -188,9 +250,9 @@ async def chat_completions(request: Request, data: VapiWebhookRequest):
         # Define the generator function that will produce the stream for Vapi
         async def response_stream_generator():
             # Get session from JAIMES (which internally manages Redis)
-            session = jaimes.get_session(
-                session_id
-            )  # Call jaimes's internal get_session
+            session = await asyncio.to_thread(
+                jaimes.get_session, session_id
+            )  # Call jaimes's internal get_session off the event loop
 
             llm_response_generator = (
                 None  # This will hold the AsyncGenerator from JAIMES's methods
@@ -205,7 +267,8 @@ async def chat_completions(request: Request, data: VapiWebhookRequest):
 
             if is_first_message_request:
                 logger.info(
-                    f"Vapi requesting first model-generated message for session {session_id}. Calling start_conversation."
+                    "Vapi requesting first model-generated message for session %s. Calling start_conversation.",
+                    session_id,
                 )
                 customer_phone = data.customer.get("number", "unknown")
                 llm_response_generator = jaimes.start_conversation(
@@ -213,7 +276,8 @@ async def chat_completions(request: Request, data: VapiWebhookRequest):
                 )
             else:
                 logger.info(
-                    f"Vapi sending user input for ongoing conversation for session {session_id}. Calling process_conversation."
+                    "Vapi sending user input for ongoing conversation for session %s. Calling process_conversation.",
+                    session_id,
                 )
                 llm_response_generator = jaimes.process_conversation(
                     user_input, session_id
@@ -233,31 +297,25 @@ async def chat_completions(request: Request, data: VapiWebhookRequest):
                         response_chunk = {
                             "choices": [{"delta": {"content": text_chunk}}]
                         }
-                        yield f"data: {json.dumps(response_chunk)}\n\n"
+                        yield _SSE_PREFIX + orjson.dumps(response_chunk) + _SSE_SUFFIX
 
                 # Send the [DONE] signal to properly end the stream
                 logger.info(
-                    f"Stream finished for session {session_id}. Sending [DONE] signal to VAPI."
+                    "Stream finished for session %s. Sending [DONE] signal to VAPI.",
+                    session_id,
                 )
-                yield "data: [DONE]\n\n"
+                yield _SSE_DONE
 
             except Exception as e:
                 logger.error(
-                    f"Error during stream generation for session {session_id}: {e}",
+                    "Error during stream generation for session %s: %s",
+                    session_id,
+                    e,
                     exc_info=True,
                 )
-                error_response_chunk = {
-                    "choices": [
-                        {
-                            "delta": {
-                                "content": "I'm experiencing a temporary issue. Please try again."
-                            }
-                        }
-                    ]
-                }
-                yield f"data: {json.dumps(error_response_chunk)}\n\n"  # Yield error chunk
-                yield "data: [DONE]\n\n"  # Close stream after error
-                full_response_text_for_logging += "I'm experiencing a temporary issue. Please try again."  # For logging error
+                yield _SSE_ERROR_CHUNK  # Yield error chunk
+                yield _SSE_DONE  # Close stream after error
+                full_response_text_for_logging += _STREAM_ERROR_MESSAGE  # For logging error
 
             # After the generator completes, save the final state of the session
             # This relies on jaimes.save_session being called within start/process_conversation.
@@ -275,7 +333,9 @@ async def chat_completions(request: Request, data: VapiWebhookRequest):
         # --- This 'except' handles errors during initial setup or before stream starts ---
         log_session_id = session_id or "unknown"
         logger.error(
-            f"Unhandled error in /chat/completions for session {log_session_id}: {e}",
+            "Unhandled error in /chat/completions for session %s: %s",
+            log_session_id,
+            e,
             exc_info=True,
         )
         # Allow explicit HTTP errors to pass through
@@ -297,21 +357,20 @@ async def chat_completions(request: Request, data: VapiWebhookRequest):
 @app.get("/sessions/{session_id}", response_model=SAIGESession)
 async def get_session_data(session_id: str):
     # Validate session_id format first so invalid IDs don't depend on JAIMES availability
-    import re as _re
-    if not _re.match(r"^[A-Za-z0-9\-_.:]+$", session_id):
+    if not _SESSION_ID_RE.fullmatch(session_id):
         # Use 404 to avoid leaking validation details; tests accept 404 or 422
         raise HTTPException(status_code=404, detail="Session not found")
 
     # Check availability; relax in TEST for MagicMocks
     is_test_env = (getattr(config, "environment", "").upper() == "TEST") or (os.getenv("ENVIRONMENT", "").upper() == "TEST")
     if (jaimes is None) or (not is_test_env and getattr(jaimes, "is_initialized", None) is not True):
-        raise HTTPException(status_code=503, detail="SAIGE system not available.")
+        return _service_unavailable()
 
     # Safely handle internal errors
     try:
-        session = jaimes.get_session(session_id)
+        session = await asyncio.to_thread(jaimes.get_session, session_id)
     except Exception as e:  # noqa: BLE001
-        logger.error(f"Error retrieving session {session_id}: {e}", exc_info=True)
+        logger.error("Error retrieving session %s: %s", session_id, e, exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
 
     if not session:
@@ -339,5 +398,9 @@ if __name__ == "__main__":
         host="0.0.0.0",  # Bind to all interfaces for container deployment
         port=port,
         log_level="info",
+        # "auto" picks uvloop/httptools when installed (uvicorn[standard] on
+        # Linux/macOS) and falls back to asyncio/h11 on Windows dev boxes
+        loop="auto",
+        http="auto",
         reload=False  # Disable reload in production
     )
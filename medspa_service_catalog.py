@@ -2,6 +2,7 @@
 Minimal med-spa service catalog used to guide intent and intake.
 """
 
+import re
 from typing import Dict, List, Optional
 
 
@@ -135,41 +136,46 @@ AUTOMATION_PHASES = {
     }
 }
 
+# Alias matching for common terms
+SERVICE_ALIASES = {
+    "consult": "consultation",
+    "skin": "consultation",
+    "assessment": "consultation",
+    "hydrafacial": "facial",
+    "anti-aging": "facial",
+    "acne treatment": "facial",
+    "wrinkle": "botox",
+    "injection": "botox",
+    "volume": "filler",
+    "plump": "filler",
+    "hair removal": "laser",
+    "skin tightening": "laser",
+    "therapeutic": "massage",
+    "relaxation": "massage"
+}
+
+# Every keyword in priority order: service names first, then aliases.
+_SERVICE_KEYWORDS = [(name, name) for name in MEDSPA_SERVICES] + list(SERVICE_ALIASES.items())
+
+# One scan of the lowered input finds every keyword occurrence; the zero-width
+# lookahead lets overlapping keywords (e.g. "skin" / "skin tightening") all report.
+# Each keyword has its own group, so match.lastindex - 1 is its priority.
+_SERVICE_KEYWORD_RE = re.compile(
+    "(?=(?:" + "|".join(f"({re.escape(keyword)})" for keyword, _ in _SERVICE_KEYWORDS) + "))"
+)
+
+
 def match_service(user_input: str) -> Optional[str]:
     """
     Matches user input to a known med-spa service.
     Returns the service key if a match is found, otherwise None.
     """
-    normalized_input = user_input.lower()
-    
-    # Direct service name matching
-    for service_name, details in MEDSPA_SERVICES.items():
-        if service_name in normalized_input:
-            return service_name
-    
-    # Alias matching for common terms
-    service_aliases = {
-        "consult": "consultation",
-        "skin": "consultation",
-        "assessment": "consultation",
-        "hydrafacial": "facial",
-        "anti-aging": "facial",
-        "acne treatment": "facial",
-        "wrinkle": "botox",
-        "injection": "botox",
-        "volume": "filler",
-        "plump": "filler",
-        "hair removal": "laser",
-        "skin tightening": "laser",
-        "therapeutic": "massage",
-        "relaxation": "massage"
-    }
-    
-    for alias, service in service_aliases.items():
-        if alias in normalized_input:
-            return service
-    
-    return None
+    best = None
+    for match in _SERVICE_KEYWORD_RE.finditer(user_input.lower()):
+        priority = match.lastindex - 1
+        if best is None or priority < best:
+            best = priority
+    return _SERVICE_KEYWORDS[best][1] if best is not None else None
 
 def get_crm_tags_for_service(service: str) -> List[str]:
     """Get CRM tags that should be applied for a specific service."""
@@ -191,7 +197,7 @@ import os
 from config import config
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Service:
     slug: str
     name: str
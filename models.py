@@ -1,6 +1,6 @@
 # /src/models.py
 # extracomment
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from datetime import datetime, date
 from enum import Enum
 from typing import Any, Dict, List, Optional
@@ -99,6 +99,9 @@ class SAIGESession(BaseModel):
     service_preferences: List[str] = Field(default_factory=list)
     scheduling_preferences: Dict[str, Any] = Field(default_factory=dict)
 
+    # Bookkeeping for RedisSessionManager.save_session; never serialized.
+    _last_saved_hash: Optional[int] = PrivateAttr(default=None)
+
     def update_state(self, new_state: ConversationState):
         """Update conversation state and timestamp"""
         self.conversation_state = new_state
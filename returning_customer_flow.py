@@ -11,46 +11,53 @@ Date: July 20, 2025
 
 import asyncio
 import re
+import time
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+# (past service, stated preference, suggested next service), checked in order
+_NEXT_SERVICE_RULES = (
+    ("facial", "anti-aging", "botox"),
+    ("botox", "volume", "filler"),
+    ("massage", "relaxation", "facial"),
+)
+
 class ReturningCustomerContext:
     """Context for returning customer conversations in med-spa setting"""
     
     def __init__(self, customer_id: str, customer_data: Dict[str, Any]):
         self.customer_id = customer_id
         self.customer_data = customer_data
-        self.conversation_start = datetime.now()
-        self.topics_discussed = []
-        self.services_mentioned = []
-        self.preferences_identified = []
+        self.conversation_start = datetime.now()  # wall clock, for the summary timestamp
+        self._start_monotonic = time.monotonic()  # immune to clock jumps, for durations
+        # Insertion-ordered dicts used as ordered sets: O(1) de-duplication
+        self.topics_discussed: Dict[str, None] = {}
+        self.services_mentioned: Dict[str, None] = {}
+        self.preferences_identified: Dict[str, None] = {}
         
     def add_topic(self, topic: str):
         """Track topics discussed in conversation"""
-        if topic not in self.topics_discussed:
-            self.topics_discussed.append(topic)
+        self.topics_discussed[topic] = None
             
     def add_service(self, service: str):
         """Track services mentioned by customer"""
-        if service not in self.services_mentioned:
-            self.services_mentioned.append(service)
+        self.services_mentioned[service] = None
             
     def add_preference(self, preference: str):
         """Track customer preferences identified"""
-        if preference not in self.preferences_identified:
-            self.preferences_identified.append(preference)
+        self.preferences_identified[preference] = None
             
     def get_conversation_summary(self) -> Dict[str, Any]:
         """Get summary of conversation for analytics"""
         return {
             "customer_id": self.customer_id,
-            "conversation_duration_minutes": (datetime.now() - self.conversation_start).total_seconds() / 60,
-            "topics_discussed": self.topics_discussed,
-            "services_mentioned": self.services_mentioned,
-            "preferences_identified": self.preferences_identified,
+            "conversation_duration_minutes": (time.monotonic() - self._start_monotonic) / 60,
+            "topics_discussed": list(self.topics_discussed),
+            "services_mentioned": list(self.services_mentioned),
+            "preferences_identified": list(self.preferences_identified),
             "timestamp": self.conversation_start.isoformat()
         }
 
@@ -118,18 +125,14 @@ class ReturningCustomerFlowManager:
                 return None
                 
             customer_data = context.customer_data
-            service_history = customer_data.get("service_history", [])
-            preferences = customer_data.get("preferences", [])
+            service_history = set(customer_data.get("service_history", ()))
+            preferences = set(customer_data.get("preferences", ()))
             
-            # Simple recommendation logic
-            if "facial" in service_history and "anti-aging" in preferences:
-                return "botox"
-            elif "botox" in service_history and "volume" in preferences:
-                return "filler"
-            elif "massage" in service_history and "relaxation" in preferences:
-                return "facial"
-            else:
-                return "consultation"
+            # Simple recommendation logic: first matching rule wins
+            for past_service, preference, suggestion in _NEXT_SERVICE_RULES:
+                if past_service in service_history and preference in preferences:
+                    return suggestion
+            return "consultation"
                 
         except Exception as e:
             self.logger.error(f"Error suggesting next service: {e}")
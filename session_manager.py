@@ -4,16 +4,17 @@ JAIMES AI Executive - Redis Session Management
 Handles persistent storage of conversation sessions using Redis.
 """
 
-import json
+import asyncio
 import logging
-from typing import Optional
+import random
+import orjson
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
 from datetime import datetime
-from dataclasses import asdict
 from tenacity import (
-    retry,
+    AsyncRetrying,
     RetryCallState,
     stop_after_attempt,
-    wait_exponential,
+    wait_random_exponential,
     retry_if_exception_type,
 )
 import redis.exceptions
@@ -27,189 +28,204 @@ from models import SAIGESession  # Import SAIGESession from models.py
 # It's recommended to install redis with: pip install redis
 try:
     import redis
+    import redis.asyncio as aredis
 except ImportError:
     print("Redis library not found. Please install it with: pip install redis")
     redis = None
+    aredis = None
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
 
-class SessionMonitor:
-    def __init__(self, session_id: str):
-        self.session_id = session_id
-        self.redis_severity = "SUCCESS"
-        self.groq_severity = "SUCCESS"
-        self.notes = []
 
-    def update_redis_severity(self, level: str, note: str = ""):
-        self.redis_severity = level
-        if note:
-            self.notes.append(f"Redis: {note}")
-
-    def update_groq_severity(self, level: str, note: str = ""):
-        self.groq_severity = level
-        if note:
-            self.notes.append(f"Groq: {note}")
-
-    def get_overall_severity(self) -> str:
-        levels = [self.redis_severity, self.groq_severity]
-        if "FAILURE" in levels:
-            return "FAILURE"
-        elif "MAJOR" in levels:
-            return "MAJOR"
-        elif "MINOR" in levels:
-            return "MINOR"
-        return "SUCCESS"
-
-
-class SessionMonitor:
-    def __init__(self, session_id: str):
-        self.session_id = session_id
-        self.redis_severity = "SUCCESS"
-        self.groq_severity = "SUCCESS"
-        self.notes = []
-        self.total_latency = None  # ✅ 2. Initialize the latency variable
-
-    # ... (your other methods like update_redis_severity) ...
+def _log_retry_attempt_number(attempt_number: int) -> None:
+    logger.warning(
+        f"Redis connection error, attempt {attempt_number} failed. Retrying..."
+    )
 
-    def set_total_latency(self, latency_ms: int):
-        self.total_latency = latency_ms
 
-    def report_embed(self):
-        # ... (color_map and emoji_map definitions are fine) ...
-        severity = self.get_overall_severity()
-        color_map = {
-            "SUCCESS": 0x2ECC71,
-            "MINOR": 0xF1C40F,
-            "MAJOR": 0xE67E22,
-            "FAILURE": 0xE74C3C,
-        }
-        emoji_map = {
-            "SUCCESS": "✅ JAIMES ran like a dream",
-            "MINOR": "⚠️ JAIMES had a minor hiccup",
-            "MAJOR": "🔥 JAIMES nearly coughed up a bolt",
-            "FAILURE": "❌ JAIMES broke down mid-session",
-        }
+def _log_retry_attempt(retry_state: RetryCallState):
+    """Logs a warning to the console before a retry attempt."""
+    # The first attempt happens outside the retry loop, hence the +1.
+    _log_retry_attempt_number(retry_state.attempt_number + 1)
 
-        # ✅ 3. Ensure this block is indented correctly
-        embed = {
-            "title": "Session Diagnostic Report",
-            "description": emoji_map.get(severity, "🔧 JAIMES ran diagnostics"),
-            "color": color_map.get(severity, 0x95A5A6),
-            "fields": [
-                {
-                    "name": "Session ID",
-                    "value": f"`{self.session_id}`",
-                    "inline": False,
-                },
-                {"name": "Redis Health", "value": self.redis_severity, "inline": True},
-                {"name": "Groq Health", "value": self.groq_severity, "inline": True},
-                # ✅ 4. Use the consistent variable name 'self.total_latency'
-                {
-                    "name": "Total Latency",
-                    "value": (
-                        f"{self.total_latency} ms"
-                        if self.total_latency is not None
-                        else "N/A"
-                    ),
-                    "inline": False,
-                },
-            ],
-            "footer": {"text": "JAIMES Diagnostic Telemetry"},
-            "timestamp": datetime.utcnow().isoformat(),
-        }
 
-        # ✅ 5. Add the action step to send the embed
-        send_discord_alert(embed=embed)
-        if self.notes:
-            embed["fields"].append(
-                {"name": "Notes", "value": "\n".join(self.notes), "inline": False}
-            )
+# Backoff before the second attempt: jittered, up to one second, matching the
+# first step of the exponential wait used inside the retry loop.
+_REDIS_FIRST_RETRY_WAIT_MAX_SECONDS = 1.0
 
-        send_discord_alert(embed=embed)
+# Shared retry policy for session commands. It is only engaged after the first
+# attempt has already failed and backed off, so two more attempts keeps the
+# total at three; its own wait starts at the next exponential step.
+_REDIS_RETRY = AsyncRetrying(
+    stop=stop_after_attempt(2),
+    wait=wait_random_exponential(multiplier=2, max=10),
+    retry=retry_if_exception_type(redis.exceptions.ConnectionError),
+    before_sleep=_log_retry_attempt,
+    reraise=True,
+)
 
 
 class RedisSessionManager:
     """Manages the lifecycle of conversation sessions using Redis."""
 
-    def __init__(self, redis_url: str):
+    def __init__(
+        self,
+        redis_url: str,
+        max_connections: int = 50,
+        session_ttl_seconds: int = 3600,
+    ):
         """Initializes the Redis client and stores the URL for lazy connection."""
         if not redis:
             raise ImportError("The 'redis' library is required but not installed.")
         self.redis_url = redis_url
+        self.max_connections = max_connections
+        # Idle timeout; every read/write slides the expiry forward.
+        self.session_ttl_seconds = session_ttl_seconds
         self.redis_client = None
         logger.info("RedisSessionManager initialized, connection will be established on first use.")
 
     def _ensure_connection(self):
-        """Ensures Redis connection is established, creating it if needed."""
+        """Ensures the async Redis client (and its connection pool) exists."""
         if self.redis_client is None:
             try:
-                self.redis_client = redis.from_url(self.redis_url, decode_responses=True)
+                self.redis_client = aredis.from_url(
+                    self.redis_url,
+                    decode_responses=False,  # payloads stay bytes; no utf-8 decode round-trip
+                    max_connections=self.max_connections,
+                    health_check_interval=30,
+                )
                 logger.info("Redis connection created successfully.")
             except Exception as e:
                 logger.error(f"Failed to create Redis connection: {e}")
                 raise  # Re-raise exception to halt operations if Redis is unavailable
 
-    def _log_retry_attempt(self, retry_state: RetryCallState):
-        """Logs a warning to the console before a retry attempt."""
-        logger.warning(
-            f"Redis connection error, attempt {retry_state.attempt_number} failed. Retrying..."
-        )
-
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, max=10),
-        retry=retry_if_exception_type(redis.exceptions.ConnectionError),
-        before_sleep=_log_retry_attempt,  # ✅ Correctly logs before each retry
-    )
-    def get_session(self, session_id: str) -> Optional["SAIGESession"]:
+    async def _with_retry(self, command: Callable[[], Awaitable[T]]) -> T:
+        """Runs a Redis command, retrying connection errors only after a first failure.
+
+        The common first-try success is a plain await; the shared retry policy is
+        copied and engaged only once a ConnectionError has been seen and the
+        first backoff has elapsed.
+        """
+        try:
+            return await command()
+        except redis.exceptions.ConnectionError:
+            _log_retry_attempt_number(1)
+        await asyncio.sleep(random.uniform(0, _REDIS_FIRST_RETRY_WAIT_MAX_SECONDS))
+        async for attempt in _REDIS_RETRY.copy():
+            with attempt:
+                return await command()
+
+    async def get_session(self, session_id: str) -> Optional["SAIGESession"]:
         """Retrieves a session from Redis by its ID."""
         self._ensure_connection()
         session_key = f"session:{session_id}"
-        session_data = self.redis_client.get(session_key)
+        # GETEX refreshes the sliding TTL in the same round-trip as the read.
+        session_data = await self._with_retry(
+            lambda: self.redis_client.getex(session_key, ex=self.session_ttl_seconds)
+        )
         if session_data:
             logger.info(f"Session cache HIT for session_id: {session_id}")
-            # Replace SAIGESession with your actual session class
-            return SAIGESession(**json.loads(session_data))
+            return SAIGESession.model_validate_json(session_data)
         else:
             logger.info(f"Session cache MISS for session_id: {session_id}")
             return None
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, max=10),
-        retry=retry_if_exception_type(redis.exceptions.ConnectionError),
-        before_sleep=_log_retry_attempt,
-    )
-    def save_session(self, session_id: str, session_obj: "SAIGESession") -> None:
+    async def get_sessions(
+        self, session_ids: List[str]
+    ) -> List[Optional["SAIGESession"]]:
+        """Retrieves several sessions in one MGET round-trip, preserving order.
+
+        Intended for cross-session reporting, so unlike get_session it does not
+        slide the TTL of the sessions it reads.
+        """
+        if not session_ids:
+            return []
+        self._ensure_connection()
+        keys = [f"session:{session_id}" for session_id in session_ids]
+        raw_sessions = await self._with_retry(lambda: self.redis_client.mget(keys))
+        return [
+            SAIGESession.model_validate_json(raw) if raw else None
+            for raw in raw_sessions
+        ]
+
+    async def save_session(self, session_id: str, session_obj: "SAIGESession") -> None:
         """Saves a session object to Redis."""
         self._ensure_connection()
         session_key = f"session:{session_id}"
-        # A more robust method would be to use Pydantic's .model_dump_json() if available
-        session_data = session_obj.model_dump_json()  # Use Pydantic's optimized method
-        self.redis_client.set(session_key, session_data)
+        session_data = orjson.dumps(session_obj.model_dump(mode="json"))
+        session_hash = hash(session_data)
+        # Nothing changed since our last SET: just slide the TTL. EXPIRE returns
+        # False when the key is gone (deleted, evicted or expired), and then the
+        # full payload has to be written again.
+        if session_hash == session_obj._last_saved_hash and await self._with_retry(
+            lambda: self.redis_client.expire(session_key, self.session_ttl_seconds)
+        ):
+            logger.debug(f"Session unchanged, skipping save for session_id: {session_id}")
+            return
+        await self._with_retry(
+            lambda: self.redis_client.set(
+                session_key, session_data, ex=self.session_ttl_seconds
+            )
+        )
+        session_obj._last_saved_hash = session_hash
         logger.info(f"Session saved for session_id: {session_id}")
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, max=10),
-        retry=retry_if_exception_type(redis.exceptions.ConnectionError),
-        before_sleep=_log_retry_attempt,
-    )
-    def delete_session(self, session_id: str) -> None:
+    async def delete_session(self, session_id: str) -> None:
         """Deletes a session from Redis."""
         self._ensure_connection()
         session_key = f"session:{session_id}"
-        self.redis_client.delete(session_key)
+        await self._with_retry(lambda: self.redis_client.delete(session_key))
         logger.info(f"Session deleted for session_id: {session_id}")
 
+    async def close(self) -> None:
+        """Releases the pooled Redis connections."""
+        if self.redis_client is not None:
+            await self.redis_client.aclose()
+            self.redis_client = None
+
+
+_session_managers: Dict[str, RedisSessionManager] = {}
+
+
+def get_session_manager(redis_url: str) -> RedisSessionManager:
+    """Returns the process-wide manager for ``redis_url`` so every caller shares one pool."""
+    manager = _session_managers.get(redis_url)
+    if manager is None:
+        manager = _session_managers[redis_url] = RedisSessionManager(redis_url)
+    return manager
+
 
 # --- In-Memory Monitoring for a Single Session ---
 
+_SEVERITY_COLORS = {
+    "SUCCESS": 0x2ECC71,
+    "MINOR": 0xF1C40F,
+    "MAJOR": 0xE67E22,
+    "FAILURE": 0xE74C3C,
+}
+_SEVERITY_DESCRIPTIONS = {
+    "SUCCESS": "✅ JAIMES ran like a dream",
+    "MINOR": "⚠️ JAIMES had a minor hiccup",
+    "MAJOR": "🔥 JAIMES nearly coughed up a bolt",
+    "FAILURE": "❌ JAIMES broke down mid-session",
+}
+
 
 class SessionMonitor:
     """Monitors the health and performance of a single request session."""
 
+    __slots__ = (
+        "session_id",
+        "redis_severity",
+        "groq_severity",
+        "notes",
+        "total_latency",
+        "redis_latency",
+        "groq_latency",
+    )
+
     def __init__(self, session_id: str):
         self.session_id = session_id
         self.redis_severity = "SUCCESS"
@@ -249,25 +265,16 @@ class SessionMonitor:
         return "SUCCESS"
 
     def report_embed(self):
-        """Builds and sends a diagnostic report embed to Discord."""
-        severity = self.get_overall_severity()
-        color_map = {
-            "SUCCESS": 0x2ECC71,
-            "MINOR": 0xF1C40F,
-            "MAJOR": 0xE67E22,
-            "FAILURE": 0xE74C3C,
-        }
-        emoji_map = {
-            "SUCCESS": "✅ JAIMES ran like a dream",
-            "MINOR": "⚠️ JAIMES had a minor hiccup",
-            "MAJOR": "🔥 JAIMES nearly coughed up a bolt",
-            "FAILURE": "❌ JAIMES broke down mid-session",
-        }
+        """Sends the diagnostic report; inside an event loop the send runs in the background."""
+        send_discord_alert(embed=self._build_embed())
 
+    def _build_embed(self) -> dict:
+        """Builds the diagnostic report embed for this session."""
+        severity = self.get_overall_severity()
         embed = {
             "title": "Session Diagnostic Report",
-            "description": emoji_map.get(severity, "🔧 JAIMES ran diagnostics"),
-            "color": color_map.get(severity, 0x95A5A6),
+            "description": _SEVERITY_DESCRIPTIONS.get(severity, "🔧 JAIMES ran diagnostics"),
+            "color": _SEVERITY_COLORS.get(severity, 0x95A5A6),
             "fields": [
                 {
                     "name": "Session ID",
@@ -312,5 +319,4 @@ class SessionMonitor:
             embed["fields"].append(
                 {"name": "Notes", "value": "\n".join(self.notes), "inline": False}
             )
-
-        send_discord_alert(embed=embed)
+        return embed
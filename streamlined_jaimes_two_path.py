@@ -13,15 +13,44 @@ Date: December 7, 2025
 
 import asyncio
 import re
+import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, replace
 from enum import Enum
 import logging
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Patterns applied to every user turn, compiled once at import
+_WHITESPACE_RE = re.compile(r"\s+")
+_VEHICLE_MAKES = ("honda", "toyota", "ford", "chevrolet", "nissan", "bmw", "mercedes")
+# A model year or any known make, found in a single scan of the input
+_VEHICLE_DETAILS_RE = re.compile(
+    r"\b(?:19|20)\d{2}\b|" + "|".join(map(re.escape, _VEHICLE_MAKES))
+)
+
+# The current year only changes once a year; refresh it hourly rather than
+# reading the clock on every validation.
+_CURRENT_YEAR_REFRESH_SECONDS = 3600
+_current_year_cache = [0, float("-inf")]
+
+
+# Plate lookups are global (not per caller), so results are cached across
+# conversations. Misses get a shorter TTL so new registrations show up soon.
+_PLATE_CACHE_TTL_SECONDS = 24 * 3600
+_PLATE_MISS_CACHE_TTL_SECONDS = 3600
+_PLATE_CACHE_MAX_ENTRIES = 10_000
+
+
+def _current_year() -> int:
+    now = time.monotonic()
+    if now - _current_year_cache[1] > _CURRENT_YEAR_REFRESH_SECONDS:
+        _current_year_cache[0] = datetime.now().year
+        _current_year_cache[1] = now
+    return _current_year_cache[0]
+
 
 class VehicleCollectionPath(Enum):
     """Vehicle information collection paths"""
@@ -31,7 +60,7 @@ class VehicleCollectionPath(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class VehicleInfo:
     """Vehicle information container"""
 
@@ -58,6 +87,21 @@ class VehicleInfo:
         """Check if vehicle info is complete enough for processing"""
         return bool(self.year and self.make and self.model)
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Flat, JSON-ready dict (collection_path as its string value)"""
+        return {
+            "year": self.year,
+            "make": self.make,
+            "model": self.model,
+            "vin": self.vin,
+            "license_plate": self.license_plate,
+            "state": self.state,
+            "zip_code": self.zip_code,
+            "mileage": self.mileage,
+            "collection_path": self.collection_path.value,
+            "confidence_score": self.confidence_score,
+        }
+
 
 class StreamlinedJAIMESSystem:
     """
@@ -69,6 +113,7 @@ class StreamlinedJAIMESSystem:
         license_plate_client=None,
         vehicle_database_client=None,
         testing_mode: bool = False,
+        simulate_latency: bool = False,
     ):
         """
         Initialize the streamlined JAIMES system
@@ -76,10 +121,17 @@ class StreamlinedJAIMESSystem:
         self.license_plate_client = license_plate_client
         self.vehicle_database_client = vehicle_database_client
         self.testing_mode = testing_mode
+        # Mock lookups answer instantly unless API latency is explicitly requested
+        self.simulate_latency = simulate_latency
         self.logger = logging.getLogger(__name__)
 
-        # Mock license plate data for testing
-        self.mock_license_plates = {
+        # (plate, state, zip) -> (expires_at, result) for real plate lookups
+        self._plate_cache: Dict[Tuple[str, str, str], Tuple[float, VehicleInfo]] = {}
+        # (plate, state, zip) -> lookup in flight, shared by concurrent cache misses
+        self._plate_inflight: Dict[Tuple[str, str, str], asyncio.Task] = {}
+
+        # Mock license plate data for testing, keyed by normalized plate
+        mock_license_plates = {
             "ABC123": {
                 "license_plate": "ABC123",
                 "state": "NC",
@@ -99,6 +151,10 @@ class StreamlinedJAIMESSystem:
                 "confidence": 0.92,
             },
         }
+        self.mock_license_plates = {
+            self._normalize_license_plate(plate): data
+            for plate, data in mock_license_plates.items()
+        }
 
     async def collect_vehicle_info_path_a(
         self, license_plate: str, zip_code: str
@@ -124,14 +180,15 @@ class StreamlinedJAIMESSystem:
     ) -> VehicleInfo:
         """Path B: Collect vehicle info via manual conversation"""
         try:
-            vehicle_info = VehicleInfo(collection_path=VehicleCollectionPath.MANUAL)
-            vehicle_info.year = self._validate_year(conversation_data.get("year"))
-            vehicle_info.make = self._validate_make(conversation_data.get("make"))
-            vehicle_info.model = self._validate_model(conversation_data.get("model"))
-            vehicle_info.mileage = self._validate_mileage(
-                conversation_data.get("mileage")
+            get = conversation_data.get
+            vehicle_info = VehicleInfo(
+                year=self._validate_year(get("year")),
+                make=self._validate_make(get("make")),
+                model=self._validate_model(get("model")),
+                mileage=self._validate_mileage(get("mileage")),
+                zip_code=get("zip_code"),
+                collection_path=VehicleCollectionPath.MANUAL,
             )
-            vehicle_info.zip_code = conversation_data.get("zip_code")
             vehicle_info.confidence_score = self._calculate_manual_confidence(
                 vehicle_info
             )
@@ -159,26 +216,23 @@ class StreamlinedJAIMESSystem:
 
     def _normalize_license_plate(self, license_plate: str) -> str:
         """Normalize license plate format"""
-        return re.sub(r"\s+", "", license_plate.upper())
+        return _WHITESPACE_RE.sub("", license_plate.upper())
 
     def _looks_like_license_plate(self, text: str) -> bool:
         """Check if text looks like a license plate"""
-        cleaned = re.sub(r"\s+", "", text.upper())
-        return bool(re.match(r"^[A-Z0-9]{3,8}$", cleaned))
+        cleaned = "".join(text.upper().split())
+        # ASCII letters/digits only, 3-8 chars; str predicates run in C with no regex
+        return 3 <= len(cleaned) <= 8 and cleaned.isascii() and cleaned.isalnum()
 
     def _contains_vehicle_details(self, text: str) -> bool:
         """Check if text contains vehicle details"""
-        text_lower = text.lower()
-        has_year = bool(re.search(r"\b(19|20)\d{2}\b", text_lower))
-        makes = ["honda", "toyota", "ford", "chevrolet", "nissan", "bmw", "mercedes"]
-        has_make = any(make in text_lower for make in makes)
-        return has_year or has_make
+        return _VEHICLE_DETAILS_RE.search(text.lower()) is not None
 
     def _validate_year(self, year_input: Any) -> Optional[int]:
         """Validate and convert year input"""
         try:
             year = int(year_input)
-            current_year = datetime.now().year
+            current_year = _current_year()
             if 0 <= year <= 99:
                 year += 2000 if year <= (current_year % 100) + 1 else 1900
             if 1950 <= year <= current_year + 1:
@@ -211,24 +265,22 @@ class StreamlinedJAIMESSystem:
 
     def _calculate_manual_confidence(self, vehicle_info: VehicleInfo) -> float:
         """Calculate confidence score for manually collected data"""
-        score = 0.0
-        if vehicle_info.year:
-            score += 0.3
-        if vehicle_info.make:
-            score += 0.3
-        if vehicle_info.model:
-            score += 0.3
-        if vehicle_info.vin:
-            score += 0.1
+        score = (
+            0.3 * bool(vehicle_info.year)
+            + 0.3 * bool(vehicle_info.make)
+            + 0.3 * bool(vehicle_info.model)
+            + 0.1 * bool(vehicle_info.vin)
+        )
         return min(score, 1.0)
 
     async def _mock_license_plate_lookup(
         self, license_plate: str, zip_code: str
     ) -> VehicleInfo:
         """Mock license plate lookup for testing"""
-        await asyncio.sleep(0.2)
-        if license_plate in self.mock_license_plates:
-            data = self.mock_license_plates[license_plate]
+        if self.simulate_latency:
+            await asyncio.sleep(0.2)
+        data = self.mock_license_plates.get(license_plate)
+        if data is not None:
             return VehicleInfo(
                 year=data["year"],
                 make=data["make"],
@@ -259,16 +311,51 @@ class StreamlinedJAIMESSystem:
                 confidence_score=0.0,
             )
 
+        state = "NC"
+        cache_key = (license_plate, state, zip_code)
+        now = time.monotonic()
+        cached = self._plate_cache.get(cache_key)
+        if cached is not None:
+            expires_at, vehicle_info = cached
+            if now < expires_at:
+                # Hand out a copy; callers are free to update the result
+                return replace(vehicle_info)
+            del self._plate_cache[cache_key]
+
+        # Concurrent misses for the same key share one API call
+        task = self._plate_inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_cache_plate(cache_key))
+            self._plate_inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._plate_inflight.pop(cache_key, None))
+        # Shielded so one caller being cancelled doesn't cancel the shared lookup
+        vehicle_info = await asyncio.shield(task)
+        return replace(vehicle_info)
+
+    async def _fetch_and_cache_plate(
+        self, cache_key: Tuple[str, str, str]
+    ) -> VehicleInfo:
+        """Calls the plate API and caches the result (or the miss) for cache_key"""
+        license_plate, state, zip_code = cache_key
         response = await self.license_plate_client.lookup_vehicle_by_plate(
-            license_plate, "NC", zip_code
+            license_plate, state, zip_code
         )
         if response.success:
-            return response.vehicle_info
-        return VehicleInfo(
-            license_plate=license_plate,
-            collection_path=VehicleCollectionPath.LICENSE_PLATE,
-            confidence_score=0.0,
-        )
+            vehicle_info = response.vehicle_info
+            ttl = _PLATE_CACHE_TTL_SECONDS
+        else:
+            vehicle_info = VehicleInfo(
+                license_plate=license_plate,
+                collection_path=VehicleCollectionPath.LICENSE_PLATE,
+                confidence_score=0.0,
+            )
+            ttl = _PLATE_MISS_CACHE_TTL_SECONDS
+
+        if len(self._plate_cache) >= _PLATE_CACHE_MAX_ENTRIES:
+            # Evict the oldest entry (dicts keep insertion order)
+            del self._plate_cache[next(iter(self._plate_cache))]
+        self._plate_cache[cache_key] = (time.monotonic() + ttl, replace(vehicle_info))
+        return vehicle_info
 
 
 # Example usage and testing
@@ -280,12 +367,12 @@ if __name__ == "__main__":
 
         print("Testing Path A (License Plate)...")
         vehicle_info_a = await system.collect_vehicle_info_path_a("ABC123", "27701")
-        print(f"Path A Result: {asdict(vehicle_info_a)}")
+        print(f"Path A Result: {vehicle_info_a.to_dict()}")
 
         print("\nTesting Path B (Manual)...")
         conversation_data = {"year": "2019", "make": "Honda", "model": "Civic"}
         vehicle_info_b = await system.collect_vehicle_info_path_b(conversation_data)
-        print(f"Path B Result: {asdict(vehicle_info_b)}")
+        print(f"Path B Result: {vehicle_info_b.to_dict()}")
 
         print("\nTesting Path Determination...")
         path = await system.determine_collection_path("My license is ABC123")
@@ -39,9 +39,12 @@ def test_redis_connection():
             test_key = "test:connection"
             test_value = "Hello SAIGE!"
             
-            client.set(test_key, test_value)
-            retrieved = client.get(test_key)
-            client.delete(test_key)
+            # One round trip for the write/read/cleanup check
+            pipe = client.pipeline(transaction=False)
+            pipe.set(test_key, test_value)
+            pipe.get(test_key)
+            pipe.delete(test_key)
+            _, retrieved, _ = pipe.execute()
             
             if retrieved == test_value.encode():
                 print("✅ Redis read/write operations successful!")
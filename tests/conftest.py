@@ -31,13 +31,19 @@ def mock_groq():
         mock_groq_client.return_value = mock_client
         yield mock_client
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
-    """FastAPI test client."""
+    """FastAPI test client, shared across the session so app startup runs once."""
     from main import app
     with TestClient(app) as test_client:
         yield test_client
 
+@pytest.fixture
+def environment(request, monkeypatch):
+    """Set config.environment for one test; parametrize it with indirect=True."""
+    monkeypatch.setattr("config.config.environment", request.param)
+    return request.param
+
 @pytest.fixture
 def sample_session():
     """Sample JAIMES session for testing."""
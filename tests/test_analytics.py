@@ -0,0 +1,77 @@
+import time
+
+import pytest
+
+import analytics
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "analytics.db")
+    analytics.init_analytics_db(path)
+    # Start from a fresh flush so the first event is buffered, not written.
+    analytics.flush_events(path)
+    yield path
+    analytics.flush_events(path)
+
+
+def test_log_event_flushes_when_batch_fills(db_path, monkeypatch):
+    monkeypatch.setattr(analytics, "EVENT_BATCH_SIZE", 3)
+    monkeypatch.setattr(analytics, "EVENT_FLUSH_INTERVAL_SECONDS", 60.0)
+
+    analytics.log_event("evt", "s1", db_path=db_path)
+    analytics.log_event("evt", "s1", db_path=db_path)
+    assert analytics.get_event_count(db_path) == 0
+
+    analytics.log_event("evt", "s1", db_path=db_path)
+    assert analytics.get_event_count(db_path) == 3
+
+
+def test_log_event_flushes_buffered_events_after_interval(db_path, monkeypatch):
+    monkeypatch.setattr(analytics, "EVENT_BATCH_SIZE", 50)
+    monkeypatch.setattr(analytics, "EVENT_FLUSH_INTERVAL_SECONDS", 0.1)
+
+    analytics.log_event("evt", "s1", {"k": "v"}, db_path=db_path)
+    assert analytics.get_event_count(db_path) == 0
+
+    deadline = time.monotonic() + 2.0
+    while analytics.get_event_count(db_path) == 0 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert analytics.get_event_count(db_path) == 1
+
+
+def test_timed_flushes_reuse_one_connection(db_path, monkeypatch):
+    monkeypatch.setattr(analytics, "EVENT_BATCH_SIZE", 50)
+    monkeypatch.setattr(analytics, "EVENT_FLUSH_INTERVAL_SECONDS", 0.05)
+    opened = []
+    connect = analytics.sqlite3.connect
+
+    def counting_connect(*args, **kwargs):
+        opened.append(args)
+        return connect(*args, **kwargs)
+
+    monkeypatch.setattr(analytics.sqlite3, "connect", counting_connect)
+
+    for burst in range(1, 4):
+        for _ in range(3):
+            analytics.log_event("evt", "s1", db_path=db_path)
+        deadline = time.monotonic() + 2.0
+        while analytics.get_event_count(db_path) < 3 * burst and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert analytics.get_event_count(db_path) == 3 * burst
+
+    # All three tail flushes ran on the same flusher thread and connection
+    assert len(opened) <= 1
+
+
+def test_probe_analytics_db_reports_missing_file_and_failed_flush(db_path, tmp_path):
+    assert analytics.probe_analytics_db(db_path) == 0
+
+    with pytest.raises(FileNotFoundError):
+        analytics.probe_analytics_db(str(tmp_path / "missing.db"))
+
+    analytics._get_connection(db_path).execute("DROP TABLE events")
+    analytics.log_event("evt", "s1", db_path=db_path)
+    analytics.flush_events(db_path)
+    with pytest.raises(analytics.sqlite3.OperationalError):
+        analytics.probe_analytics_db(db_path)
@@ -1,3 +1,6 @@
+import time
+from unittest.mock import MagicMock
+
 import pytest
 from models import SAIGESession, ConversationState, ChatMessage, CustomerProfile
 from complete_saige import CompleteSAIGESystem
@@ -82,3 +85,95 @@ async def test_returning_customer_phone_lookup(monkeypatch):
     assert updated.conversation_state in [ConversationState.SERVICE_SELECTION, ConversationState.PHONE_NUMBER_CLARIFICATION]
 
 
+def test_expired_memory_session_is_not_returned():
+    system = CompleteSAIGESystem(groq_api_key="test", redis_url="redis://localhost:6379")
+    system.redis_client = MagicMock()
+    system.redis_client.get.return_value = None
+    session = SAIGESession(
+        session_id="s3",
+        caller_phone="1234567890",
+        conversation_state=ConversationState.PRIOR_SERVICE_CONFIRMATION,
+    )
+    system.in_memory_sessions["s3"] = session
+    system._in_memory_expiry["s3"] = time.monotonic() + 60
+    assert system.get_session("s3") is session
+
+    system._in_memory_expiry["s3"] = time.monotonic() - 1
+    assert system.get_session("s3") is None
+    assert "s3" not in system.in_memory_sessions
+
+
+def test_memory_purge_runs_when_redis_save_succeeds():
+    system = CompleteSAIGESystem(groq_api_key="test", redis_url="redis://localhost:6379")
+    system.redis_client = MagicMock()
+    stale = SAIGESession(
+        session_id="old",
+        caller_phone="1234567890",
+        conversation_state=ConversationState.PRIOR_SERVICE_CONFIRMATION,
+    )
+    system.in_memory_sessions["old"] = stale
+    system._in_memory_expiry["old"] = time.monotonic() - 1
+
+    system.save_session("new", stale.model_copy(update={"session_id": "new"}))
+    system.redis_client.set.assert_called_once()
+    assert "old" not in system.in_memory_sessions
+    assert "old" not in system._in_memory_expiry
+
+
+def test_match_service_keyword_priority_and_case_folding():
+    assert match_service("MASSAGE please") == "massage"
+    # Service names outrank aliases, and overlapping aliases keep list order
+    assert match_service("hair removal and botox") == "botox"
+    assert match_service("I want skin tightening") == "consultation"
+    # Non-ASCII case folds ("ſ" ~ "s", "İ" ~ "i") are not keyword matches
+    assert match_service("maſſage please") is None
+    assert match_service("İnjection") is None
+
+
+@pytest.mark.asyncio
+async def test_llm_stream_open_retries_transient_errors_only(monkeypatch):
+    import httpx
+    from groq import APIStatusError
+
+    system = CompleteSAIGESystem(groq_api_key="test", redis_url="redis://localhost:6379")
+
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr(CompleteSAIGESystem._open_llm_stream.retry, "sleep", no_sleep)
+    calls = []
+
+    async def failing_create(**kwargs):
+        calls.append(kwargs)
+        raise ConnectionError("connection reset")
+
+    system.groq_client.chat.completions.create = failing_create
+    with pytest.raises(ConnectionError):
+        await system._open_llm_stream([])
+    assert len(calls) == 3
+
+    calls.clear()
+    request = httpx.Request("POST", "https://api.groq.com")
+
+    async def rejected_create(**kwargs):
+        calls.append(kwargs)
+        raise APIStatusError("bad request", response=httpx.Response(400, request=request), body=None)
+
+    system.groq_client.chat.completions.create = rejected_create
+    with pytest.raises(APIStatusError):
+        await system._open_llm_stream([])
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_mock_customer_lookup_returns_independent_profiles():
+    from mock_db import MockCustomerEngine
+
+    engine = MockCustomerEngine()
+    first = await engine.find_customer_by_phone("8087790738")
+    first.name = "Someone Else"
+    first.service_history.clear()
+
+    second = await engine.find_customer_by_phone("8087790738")
+    assert second.name == "Lex Jimenez"
+    assert len(second.service_history) == 1
@@ -0,0 +1,84 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import streamlined_jaimes_two_path as jaimes_module
+from streamlined_jaimes_two_path import StreamlinedJAIMESSystem, VehicleInfo
+
+
+class StubPlateClient:
+    """Counts plate API calls and answers after a short delay."""
+
+    def __init__(self, success=True, delay=0.01):
+        self.calls = 0
+        self.success = success
+        self.delay = delay
+
+    async def lookup_vehicle_by_plate(self, plate, state, zip_code):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        vehicle_info = VehicleInfo(year=2020, make="Honda", model="Civic", license_plate=plate)
+        return SimpleNamespace(success=self.success, vehicle_info=vehicle_info)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_api_call():
+    client = StubPlateClient()
+    system = StreamlinedJAIMESSystem(license_plate_client=client)
+
+    results = await asyncio.gather(
+        *(system._real_license_plate_lookup("ABC123", "27601") for _ in range(50))
+    )
+
+    assert client.calls == 1
+    assert all(r.description == "2020 Honda Civic" for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_lookup():
+    client = StubPlateClient(delay=0.05)
+    system = StreamlinedJAIMESSystem(license_plate_client=client)
+
+    first = asyncio.ensure_future(system._real_license_plate_lookup("ABC123", "27601"))
+    second = asyncio.ensure_future(system._real_license_plate_lookup("ABC123", "27601"))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    result = await second
+    assert first.cancelled()
+    assert result.make == "Honda"
+    assert client.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_miss_is_refetched_after_miss_ttl(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(jaimes_module, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+    client = StubPlateClient(success=False, delay=0)
+    system = StreamlinedJAIMESSystem(license_plate_client=client)
+
+    await system._real_license_plate_lookup("ZZZ999", "27601")
+    clock[0] += jaimes_module._PLATE_MISS_CACHE_TTL_SECONDS - 1
+    await system._real_license_plate_lookup("ZZZ999", "27601")
+    assert client.calls == 1
+
+    clock[0] += 1
+    result = await system._real_license_plate_lookup("ZZZ999", "27601")
+    assert client.calls == 2
+    assert result.confidence_score == 0.0
+
+
+@pytest.mark.asyncio
+async def test_mutating_result_does_not_change_cache():
+    client = StubPlateClient(delay=0)
+    system = StreamlinedJAIMESSystem(license_plate_client=client)
+
+    first = await system._real_license_plate_lookup("ABC123", "27601")
+    first.make = "Toyota"
+    first.mileage = 12345
+
+    second = await system._real_license_plate_lookup("ABC123", "27601")
+    assert client.calls == 1
+    assert second.make == "Honda"
+    assert second.mileage is None
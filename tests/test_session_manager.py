@@ -0,0 +1,93 @@
+import pytest
+import redis.exceptions
+
+import session_manager
+from models import SAIGESession, ConversationState
+from session_manager import RedisSessionManager
+
+
+class FakeRedis:
+    """In-memory stand-in for the async Redis client that counts SETs."""
+
+    def __init__(self):
+        self.store = {}
+        self.set_calls = 0
+
+    async def set(self, key, value, ex=None):
+        self.set_calls += 1
+        self.store[key] = value
+        return True
+
+    async def expire(self, key, seconds):
+        return key in self.store
+
+    async def delete(self, key):
+        return int(self.store.pop(key, None) is not None)
+
+
+def _make_manager():
+    manager = RedisSessionManager("redis://localhost:6379")
+    manager.redis_client = FakeRedis()
+    return manager
+
+
+def _make_session():
+    return SAIGESession(
+        session_id="s1",
+        caller_phone="1234567890",
+        conversation_state=ConversationState.CUSTOMER_VERIFICATION,
+    )
+
+
+@pytest.mark.asyncio
+async def test_save_session_skips_unchanged_and_writes_after_change():
+    manager = _make_manager()
+    session = _make_session()
+
+    await manager.save_session("s1", session)
+    await manager.save_session("s1", session)
+    assert manager.redis_client.set_calls == 1
+
+    session.total_interactions += 1
+    await manager.save_session("s1", session)
+    assert manager.redis_client.set_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_save_session_rewrites_after_key_is_gone():
+    manager = _make_manager()
+    session = _make_session()
+
+    await manager.save_session("s1", session)
+    await manager.delete_session("s1")
+    await manager.save_session("s1", session)
+    assert manager.redis_client.set_calls == 2
+    assert "session:s1" in manager.redis_client.store
+
+    # An eviction or expiry on the server side behaves the same way.
+    manager.redis_client.store.clear()
+    await manager.save_session("s1", session)
+    assert manager.redis_client.set_calls == 3
+
+
+@pytest.mark.asyncio
+async def test_with_retry_backs_off_before_second_attempt(monkeypatch):
+    manager = _make_manager()
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(session_manager.asyncio, "sleep", fake_sleep)
+    calls = []
+
+    async def flaky_command():
+        calls.append(len(sleeps))
+        if len(calls) == 1:
+            raise redis.exceptions.ConnectionError("connection reset")
+        return "ok"
+
+    assert await manager._with_retry(flaky_command) == "ok"
+    # The second attempt only ran after one backoff sleep
+    assert calls == [0, 1]
+    assert 0 <= sleeps[0] <= session_manager._REDIS_FIRST_RETRY_WAIT_MAX_SECONDS
@@ -0,0 +1,128 @@
+import asyncio
+
+import httpx
+import pytest
+
+import utils
+
+
+@pytest.fixture
+def alert_worker(monkeypatch):
+    """Isolated alert worker state with a recording, initially failing sender."""
+    monkeypatch.setattr(utils, "_WEBHOOK_ENABLED", True)
+    monkeypatch.setattr(utils, "_alert_queue", None)
+    monkeypatch.setattr(utils, "_alert_worker_task", None)
+    sent = []
+
+    async def fake_post(payload):
+        if payload.get("content") == "boom":
+            raise RuntimeError("unexpected failure")
+        sent.append(payload)
+
+    monkeypatch.setattr(utils, "_post_payload", fake_post)
+    return sent
+
+
+@pytest.mark.asyncio
+async def test_alert_worker_survives_failed_batch(alert_worker):
+    utils.start_alert_worker()
+    try:
+        utils.send_discord_alert("boom")
+        await utils._alert_queue.join()
+        utils.send_discord_alert("after")
+        await utils._alert_queue.join()
+        assert alert_worker == [{"content": "after"}]
+        assert not utils._alert_worker_task.done()
+    finally:
+        await utils.stop_alert_worker()
+
+
+@pytest.mark.asyncio
+async def test_send_discord_alert_restarts_stopped_worker(alert_worker):
+    utils.start_alert_worker()
+    try:
+        utils._alert_worker_task.cancel()
+        await asyncio.sleep(0)
+        utils.send_discord_alert("after restart")
+        await asyncio.wait_for(utils._alert_queue.join(), timeout=1.0)
+        assert alert_worker == [{"content": "after restart"}]
+    finally:
+        await utils.stop_alert_worker()
+
+
+@pytest.mark.asyncio
+async def test_discord_client_reopens_after_shutdown(monkeypatch):
+    closed = httpx.AsyncClient()
+    await closed.aclose()
+    monkeypatch.setattr(utils, "_discord_client", closed)
+
+    reopened = utils._get_discord_client()
+    assert reopened is not closed and not reopened.is_closed
+    await reopened.aclose()
+
+
+def _queued(content=None, embed=None):
+    payload = utils._build_payload(content, embed)
+    return payload, sum(len(utils.orjson.dumps(e)) for e in payload.get("embeds", ()))
+
+
+def test_merge_payloads_splits_on_content_limit(monkeypatch):
+    monkeypatch.setattr(utils, "_WEBHOOK_ENABLED", True)
+    first, second = "a" * 1500, "b" * 600
+    merged = utils._merge_payloads([_queued(first), _queued(second)])
+    assert merged == [{"content": first}, {"content": second}]
+
+    short = "c" * 499
+    merged = utils._merge_payloads([_queued(first), _queued(short)])
+    assert merged == [{"content": first + "\n" + short}]
+    assert len(merged[0]["content"]) == utils._DISCORD_CONTENT_LIMIT
+
+
+def test_merge_payloads_splits_on_embed_limit(monkeypatch):
+    monkeypatch.setattr(utils, "_WEBHOOK_ENABLED", True)
+    big = {"description": "x" * 3500}
+    merged = utils._merge_payloads([_queued(embed=big), _queued(embed=big)])
+    assert merged == [{"embeds": [big]}, {"embeds": [big]}]
+
+    small = {"description": "y" * 100}
+    merged = utils._merge_payloads([_queued(embed=big), _queued(embed=small)])
+    assert merged == [{"embeds": [big, small]}]
+
+
+def test_merge_payloads_preserves_order(monkeypatch):
+    monkeypatch.setattr(utils, "_WEBHOOK_ENABLED", True)
+    batch = [
+        _queued("one"),
+        _queued(embed={"title": "two"}),
+        _queued("3" * 1998),
+        _queued("4", {"title": "four"}),
+    ]
+    merged = utils._merge_payloads(batch)
+    assert merged == [
+        {"content": "one", "embeds": [{"title": "two"}]},
+        {"content": "3" * 1998 + "\n4", "embeds": [{"title": "four"}]},
+    ]
+
+    # Content after queued embeds would render above them, so it starts a new message
+    batch = [
+        _queued(embed={"title": "A"}),
+        _queued("B"),
+        _queued("C", {"title": "C"}),
+        _queued("D"),
+    ]
+    merged = utils._merge_payloads(batch)
+    assert merged == [
+        {"embeds": [{"title": "A"}]},
+        {"content": "B\nC", "embeds": [{"title": "C"}]},
+        {"content": "D"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_send_discord_alert_drops_unserializable_embed(alert_worker):
+    utils.start_alert_worker()
+    try:
+        utils.send_discord_alert(embed={"fields": {object()}})
+        assert utils._alert_queue.qsize() == 0
+    finally:
+        await utils.stop_alert_worker()
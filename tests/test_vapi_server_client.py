@@ -0,0 +1,15 @@
+import pytest
+
+from vapi_server_client import VAPIServerClient
+
+
+@pytest.mark.asyncio
+async def test_client_reopens_after_aclose():
+    vapi = VAPIServerClient(api_key="test-vapi-key")
+    first = vapi._client
+    await vapi.aclose()
+    assert first.is_closed
+
+    assert vapi._client is not first and not vapi._client.is_closed
+    assert vapi._client.headers["Authorization"] == "Bearer test-vapi-key"
+    await vapi.aclose()
@@ -1,8 +1,11 @@
 # /src/utils.py
 
+import asyncio
 import os
-import requests
+import httpx
 import logging
+import orjson
+from typing import List, Optional, Set, Tuple
 from config import config
 
 # Set up basic logging to see success or failure messages in your Render logs
@@ -13,15 +16,38 @@ logging.basicConfig(
 # Get the URL from the single source of truth
 DISCORD_WEBHOOK_URL = config.discord_webhook_url
 
+# Resolved once at import instead of on every alert
+_WEBHOOK_ENABLED = bool(DISCORD_WEBHOOK_URL) and "placeholder" not in DISCORD_WEBHOOK_URL
 
-def send_discord_alert(content: str = None, embed: dict = None):
-    """
-    Sends a message or a rich embed to the Discord webhook.
-    """
+# Alerts are best-effort: a slow Discord must never hold up a request, so keep
+# the timeouts short and reuse one pooled async client for every alert.
+_DISCORD_TIMEOUT = httpx.Timeout(3.0, connect=1.0)
+_discord_client: Optional[httpx.AsyncClient] = None
+
+# Strong references to in-flight fire-and-forget alert tasks.
+_ALERT_TASKS: Set[asyncio.Task] = set()
+
+# Producers only enqueue; one background worker owns the network round-trip.
+# The bound sheds alerts under a burst rather than letting memory grow.
+_ALERT_QUEUE_MAXSIZE = 1000
+_ALERT_DRAIN_TIMEOUT_SECONDS = 2.0
+_alert_queue: Optional[asyncio.Queue] = None
+
+# Discord accepts up to 10 embeds per webhook message, so the worker coalesces
+# whatever arrives within a short window into one POST, within Discord's limits.
+_ALERT_BATCH_SIZE = 10
+_ALERT_BATCH_WINDOW_SECONDS = 0.1
+_DISCORD_CONTENT_LIMIT = 2000
+_DISCORD_EMBED_CHARS_LIMIT = 6000
+_alert_worker_task: Optional[asyncio.Task] = None
+
+
+def _build_payload(content: Optional[str], embed: Optional[dict]) -> Optional[dict]:
+    """Builds the webhook payload, or returns None if alerts are off or it would be empty."""
     # 1. Check if the webhook URL is configured
-    if not DISCORD_WEBHOOK_URL or "placeholder" in DISCORD_WEBHOOK_URL:
+    if not _WEBHOOK_ENABLED:
         logging.error("Discord webhook URL is not set or is a placeholder.")
-        return
+        return None
 
     # 2. Prepare the payload for Discord's API
     payload = {}
@@ -34,13 +60,208 @@ def send_discord_alert(content: str = None, embed: dict = None):
     # Don't send an empty payload
     if not payload:
         logging.warning("send_discord_alert was called with no content or embed.")
-        return
+        return None
+    return payload
+
 
-    # 3. Send the request with error handling
+def _get_discord_client() -> httpx.AsyncClient:
+    """Returns the pooled Discord client, reopening it after a previous shutdown."""
+    global _discord_client
+    if _discord_client is None or _discord_client.is_closed:
+        _discord_client = httpx.AsyncClient(
+            timeout=_DISCORD_TIMEOUT, limits=httpx.Limits(max_keepalive_connections=20)
+        )
+    return _discord_client
+
+
+async def _post_payload(payload: dict):
+    """POSTs one prepared payload to the webhook, logging instead of raising."""
     try:
-        response = requests.post(DISCORD_WEBHOOK_URL, json=payload)
+        response = await _get_discord_client().post(
+            DISCORD_WEBHOOK_URL,
+            content=orjson.dumps(payload),
+            headers={"Content-Type": "application/json"},
+        )
         # Raise an exception if the request returned an unsuccessful status code (like 404 or 500)
         response.raise_for_status()
         logging.info("Discord alert sent successfully.")
-    except requests.exceptions.RequestException as e:
+    except (httpx.HTTPError, TypeError) as e:
+        logging.error(f"Failed to send Discord alert: {e}")
+
+
+async def send_discord_alert_async(content: str = None, embed: dict = None):
+    """
+    Sends a message or a rich embed to the Discord webhook without blocking the event loop.
+    """
+    payload = _build_payload(content, embed)
+    if payload is None:
+        return
+    await _post_payload(payload)
+
+
+def send_discord_alert(content: str = None, embed: dict = None):
+    """
+    Sends a message or a rich embed to the Discord webhook.
+
+    Once the alert worker is running this only enqueues the payload and returns;
+    outside an event loop (startup, scripts) it is sent inline.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _send_discord_alert_blocking(content, embed)
+        return
+
+    if _alert_queue is not None:
+        _ensure_alert_worker(loop)
+        payload = _build_payload(content, embed)
+        if payload is None:
+            return
+        # Serialize at enqueue so a bad embed is rejected here, at its caller,
+        # rather than failing a whole merged batch in the worker.
+        try:
+            embed_chars = sum(len(orjson.dumps(e)) for e in payload.get("embeds", ()))
+        except TypeError as e:
+            logging.error(f"Dropping Discord alert with an unserializable embed: {e}")
+            return
+        try:
+            _alert_queue.put_nowait((payload, embed_chars))
+        except asyncio.QueueFull:
+            logging.warning("Discord alert queue is full; dropping alert.")
+        return
+
+    # Worker not started (e.g. used outside the app): send in the background.
+    task = loop.create_task(send_discord_alert_async(content=content, embed=embed))
+    # Hold a strong reference until done so the task isn't garbage-collected mid-flight.
+    _ALERT_TASKS.add(task)
+    task.add_done_callback(_ALERT_TASKS.discard)
+
+
+def _merge_payloads(batch: List[Tuple[dict, int]]) -> List[dict]:
+    """Coalesces queued (payload, embed_chars) items into as few webhook messages
+    as Discord's limits allow, keeping their order."""
+    merged = []
+    contents: List[str] = []
+    embeds: List[dict] = []
+    content_len = 0
+    embed_chars = 0
+
+    def _flush():
+        payload = {}
+        if contents:
+            payload["content"] = "\n".join(contents)
+        if embeds:
+            payload["embeds"] = list(embeds)
+        merged.append(payload)
+
+    # item_embed_chars is the embeds' serialized size, which over-counts
+    # Discord's embed text total, so it is a safe bound.
+    for payload, item_embed_chars in batch:
+        content = payload.get("content")
+        item_embeds = payload.get("embeds", ())
+        add_len = (len(content) + (1 if contents else 0)) if content else 0
+        # Discord renders content above embeds, so content arriving after queued
+        # embeds starts a new message to keep the alerts in order.
+        if (contents or embeds) and (
+            content_len + add_len > _DISCORD_CONTENT_LIMIT
+            or embed_chars + item_embed_chars > _DISCORD_EMBED_CHARS_LIMIT
+            or (content and embeds)
+        ):
+            _flush()
+            contents, embeds = [], []
+            content_len = embed_chars = 0
+            add_len = len(content) if content else 0
+        if content:
+            contents.append(content)
+            content_len += add_len
+        embeds.extend(item_embeds)
+        embed_chars += item_embed_chars
+
+    if contents or embeds:
+        _flush()
+    return merged
+
+
+async def _alert_worker(queue: asyncio.Queue):
+    """Drains the alert queue, posting up to 10 queued alerts per webhook call."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + _ALERT_BATCH_WINDOW_SECONDS
+        while len(batch) < _ALERT_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        try:
+            for payload in _merge_payloads(batch):
+                await _post_payload(payload)
+        except Exception:
+            # One bad batch must not take the worker (and every later alert) down.
+            logging.exception("Failed to send a batch of %d Discord alerts.", len(batch))
+        finally:
+            for _ in batch:
+                queue.task_done()
+
+
+def start_alert_worker():
+    """Creates the alert queue and its worker on the running loop; call on startup."""
+    global _alert_queue, _alert_worker_task
+    if _alert_worker_task is not None and not _alert_worker_task.done():
+        return
+    _alert_queue = asyncio.Queue(maxsize=_ALERT_QUEUE_MAXSIZE)
+    _alert_worker_task = asyncio.create_task(_alert_worker(_alert_queue))
+
+
+def _ensure_alert_worker(loop: asyncio.AbstractEventLoop):
+    """Restarts the alert worker on the existing queue if it has stopped."""
+    global _alert_worker_task
+    task = _alert_worker_task
+    if task is None or not task.done():
+        return
+    if task.cancelled():
+        logging.error("Discord alert worker was cancelled; restarting it.")
+    else:
+        logging.error("Discord alert worker died; restarting it.", exc_info=task.exception())
+    _alert_worker_task = loop.create_task(_alert_worker(_alert_queue))
+
+
+async def stop_alert_worker():
+    """Gives queued alerts a short window to go out, then stops the worker."""
+    global _alert_queue, _alert_worker_task
+    queue, task = _alert_queue, _alert_worker_task
+    _alert_queue, _alert_worker_task = None, None
+    if task is None:
+        return
+    try:
+        await asyncio.wait_for(queue.join(), timeout=_ALERT_DRAIN_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        logging.warning("Dropping %d unsent Discord alerts on shutdown.", queue.qsize())
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+def _send_discord_alert_blocking(content: Optional[str], embed: Optional[dict]):
+    """Inline send for callers with no event loop; uses a one-off sync request."""
+    payload = _build_payload(content, embed)
+    if payload is None:
+        return
+    try:
+        response = httpx.post(DISCORD_WEBHOOK_URL, json=payload, timeout=_DISCORD_TIMEOUT)
+        response.raise_for_status()
+        logging.info("Discord alert sent successfully.")
+    except httpx.HTTPError as e:
         logging.error(f"Failed to send Discord alert: {e}")
+
+
+async def aclose_discord_client():
+    """Flushes the alert queue and closes the pooled Discord client; call on shutdown."""
+    await stop_alert_worker()
+    if _discord_client is not None:
+        await _discord_client.aclose()
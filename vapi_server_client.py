@@ -4,15 +4,30 @@ No pyaudio dependency - works perfectly on Render
 """
 
 import httpx
+import orjson
 from typing import Dict, Any, Optional, List
 from pydantic import BaseModel
 import asyncio
+import time
 from datetime import datetime
+from functools import lru_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _isoformat(dt: datetime) -> str:
+    """isoformat() memoized for datetimes reused across polling calls"""
+    # Aware datetimes for the same instant compare equal across offsets, so the
+    # offset is part of the key to keep each offset's own rendering
+    return _isoformat_cached(dt, dt.utcoffset())
+
+
+@lru_cache(maxsize=1024)
+def _isoformat_cached(dt: datetime, _offset) -> str:
+    return dt.isoformat()
+
+
 class VAPIPhoneCall(BaseModel):
     """Phone call configuration"""
 
@@ -38,10 +53,57 @@ class VAPIServerClient:
     def __init__(self, api_key: str, base_url: str = "https://api.vapi.ai"):
         self.api_key = api_key
         self.base_url = base_url
-        self.headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        }
+
+        # The static auth headers are encoded once here; methods never pass
+        # per-call headers.
+        self._headers = httpx.Headers(
+            {
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            encoding="ascii",
+        )
+        self._http: Optional[httpx.AsyncClient] = None
+
+        # Caps concurrent requests from bulk helpers to stay under VAPI rate limits
+        self._bulk_semaphore = asyncio.Semaphore(20)
+
+        # Fixed endpoint URLs, built once instead of per request
+        self._phone_calls_url = f"{base_url}/v1/calls/phone"
+        self._web_calls_url = f"{base_url}/v1/calls/web"
+        self._calls_url = f"{base_url}/v1/calls"
+        self._assistants_url = f"{base_url}/v1/assistants"
+        self._default_assistants_url = f"{base_url}/v1/assistants?limit=100"
+        # Prefixes for per-ID endpoints, completed by plain concatenation
+        self._call_url_prefix = f"{base_url}/v1/calls/"
+        self._assistant_url_prefix = f"{base_url}/v1/assistants/"
+        self._phone_numbers_url = f"{base_url}/v1/phone-numbers"
+        self._analytics_url = f"{base_url}/v1/analytics"
+
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        """Pooled HTTP client, reopened on first use after aclose()"""
+        # One pooled client serves every request so calls reuse warm TCP/TLS
+        # connections; recreating it after aclose() keeps the object usable
+        # across app lifespans (e.g. repeated TestClient startups).
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                headers=self._headers,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                timeout=httpx.Timeout(10.0, connect=5.0),
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client"""
+        if self._http is not None:
+            await self._http.aclose()
+
+    async def __aenter__(self) -> "VAPIServerClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
 
     # ===== PHONE CALLS =====
 
@@ -70,12 +132,12 @@ class VAPIServerClient:
 
         payload.update(kwargs)
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/v1/calls/phone", headers=self.headers, json=payload
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._client.post(
+            self._phone_calls_url,
+            content=orjson.dumps(payload),
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     # ===== WEB CALLS (Browser-based) =====
 
@@ -93,27 +155,35 @@ class VAPIServerClient:
         if metadata:
             payload["metadata"] = metadata
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/v1/calls/web", headers=self.headers, json=payload
-            )
-            response.raise_for_status()
-            result = response.json()
+        response = await self._client.post(
+            self._web_calls_url,
+            content=orjson.dumps(payload),
+        )
+        response.raise_for_status()
+        result = orjson.loads(response.content)
 
-            # The response includes a URL that users can open in their browser
-            # Example: https://vapi.ai/call/xxxxx
-            return result
+        # The response includes a URL that users can open in their browser
+        # Example: https://vapi.ai/call/xxxxx
+        return result
 
     # ===== CALL MANAGEMENT =====
 
     async def get_call(self, call_id: str) -> Dict[str, Any]:
         """Get details about a specific call"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/v1/calls/{call_id}", headers=self.headers
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._client.get(self._call_url_prefix + call_id)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    async def get_calls_bulk(self, call_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get details for several calls concurrently, in the order given"""
+
+        async def _get_call_limited(call_id: str) -> Dict[str, Any]:
+            async with self._bulk_semaphore:
+                return await self.get_call(call_id)
+
+        return list(
+            await asyncio.gather(*(_get_call_limited(cid) for cid in call_ids))
+        )
 
     async def list_calls(
         self,
@@ -123,30 +193,30 @@ class VAPIServerClient:
         status: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """List all calls with optional filters"""
+        if not (created_at_gt or created_at_lt or status):
+            # Common polling case: no filters, so skip building params
+            response = await self._client.get(f"{self._calls_url}?limit={limit}")
+            response.raise_for_status()
+            return orjson.loads(response.content)
+
         params = {"limit": limit}
 
         if created_at_gt:
-            params["createdAtGt"] = created_at_gt.isoformat()
+            params["createdAtGt"] = _isoformat(created_at_gt)
         if created_at_lt:
-            params["createdAtLt"] = created_at_lt.isoformat()
+            params["createdAtLt"] = _isoformat(created_at_lt)
         if status:
             params["status"] = status
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/v1/calls", headers=self.headers, params=params
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._client.get(self._calls_url, params=params)
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     async def end_call(self, call_id: str) -> Dict[str, Any]:
         """End an ongoing call"""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/v1/calls/{call_id}/end", headers=self.headers
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._client.post(self._call_url_prefix + call_id + "/end")
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     # ===== ASSISTANTS =====
 
@@ -175,58 +245,48 @@ class VAPIServerClient:
             "firstMessage": "Hello, I'm calling on behalf of Jaime..."
         }
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/v1/assistants",
-                headers=self.headers,
-                json=assistant_config,
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._client.post(
+            self._assistants_url,
+            content=orjson.dumps(assistant_config),
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     async def update_assistant(
         self, assistant_id: str, updates: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Update an existing assistant"""
-        async with httpx.AsyncClient() as client:
-            response = await client.patch(
-                f"{self.base_url}/v1/assistants/{assistant_id}",
-                headers=self.headers,
-                json=updates,
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._client.patch(
+            self._assistant_url_prefix + assistant_id,
+            content=orjson.dumps(updates),
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     async def get_assistant(self, assistant_id: str) -> Dict[str, Any]:
         """Get assistant details"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/v1/assistants/{assistant_id}", headers=self.headers
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._client.get(self._assistant_url_prefix + assistant_id)
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     async def list_assistants(self, limit: int = 100) -> List[Dict[str, Any]]:
         """List all assistants"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/v1/assistants",
-                headers=self.headers,
-                params={"limit": limit},
-            )
-            response.raise_for_status()
-            return response.json()
+        url = (
+            self._default_assistants_url
+            if limit == 100
+            else f"{self._assistants_url}?limit={limit}"
+        )
+        response = await self._client.get(url)
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     # ===== PHONE NUMBERS =====
 
     async def list_phone_numbers(self) -> List[Dict[str, Any]]:
         """List available phone numbers for outbound calls"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/v1/phone-numbers", headers=self.headers
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._client.get(self._phone_numbers_url)
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     # ===== ANALYTICS =====
 
@@ -234,14 +294,14 @@ class VAPIServerClient:
         self, start_date: datetime, end_date: datetime
     ) -> Dict[str, Any]:
         """Get call analytics for a date range"""
-        params = {"startDate": start_date.isoformat(), "endDate": end_date.isoformat()}
+        params = {
+            "startDate": _isoformat(start_date),
+            "endDate": _isoformat(end_date),
+        }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/v1/analytics", headers=self.headers, params=params
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._client.get(self._analytics_url, params=params)
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
 
 # ===== USAGE EXAMPLE =====
@@ -253,59 +313,97 @@ async def example_usage():
     # Initialize client
     vapi = VAPIServerClient(api_key="your-vapi-api-key")
 
-    # 1. Create an outbound phone call
-    call_result = await vapi.create_phone_call(
-        phone_number="+1234567890",
-        assistant_id="your-assistant-id",
-        customer_name="John Doe",
-        metadata={"purpose": "follow_up", "account_id": "12345"},
+    # 1 & 2. Create an outbound phone call and a web call URL (for
+    # browser-based calls); they're independent, so run them concurrently
+    call_result, web_call = await asyncio.gather(
+        vapi.create_phone_call(
+            phone_number="+1234567890",
+            assistant_id="your-assistant-id",
+            customer_name="John Doe",
+            metadata={"purpose": "follow_up", "account_id": "12345"},
+        ),
+        vapi.create_web_call_url(
+            assistant_id="your-assistant-id", metadata={"session_id": "abc123"}
+        ),
     )
     print(f"Call initiated: {call_result['id']}")
-
-    # 2. Create a web call URL (for browser-based calls)
-    web_call = await vapi.create_web_call_url(
-        assistant_id="your-assistant-id", metadata={"session_id": "abc123"}
-    )
     print(f"Web call URL: {web_call['url']}")
 
-    # 3. Check call status
-    call_details = await vapi.get_call(call_result["id"])
+    # 3 & 4. Check call status and list recent calls
+    call_details, recent_calls = await asyncio.gather(
+        vapi.get_call(call_result["id"]), vapi.list_calls(limit=10)
+    )
     print(f"Call status: {call_details['status']}")
-
-    # 4. List recent calls
-    recent_calls = await vapi.list_calls(limit=10)
     for call in recent_calls:
         print(f"Call {call['id']}: {call['status']}")
 
+    # 5. Fetch full details for the recent calls in one concurrent batch
+    details = await vapi.get_calls_bulk([call["id"] for call in recent_calls])
+    print(f"Fetched details for {len(details)} calls")
+
 
 # ===== INTEGRATION WITH YOUR FASTAPI APP =====
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel as PydanticBaseModel
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await vapi_client.aclose()
+
 
-app = FastAPI()
+# ORJSONResponse skips jsonable_encoder and serializes with orjson
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Initialize VAPI client
 vapi_client = VAPIServerClient(api_key="your-vapi-api-key")
 
+# UTC ISO timestamp at second granularity, re-formatted only when the second ticks
+_utc_iso_second = -1
+_utc_iso_value = ""
 
-class CallRequest(PydanticBaseModel):
-    phone_number: str
-    customer_name: str
-    purpose: str
+
+def _utc_now_iso() -> str:
+    global _utc_iso_second, _utc_iso_value
+    now = int(time.time())
+    if now != _utc_iso_second:
+        _utc_iso_value = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now))
+        _utc_iso_second = now
+    return _utc_iso_value
+
+
+_CALL_REQUEST_FIELDS = ("phone_number", "customer_name", "purpose")
+
+
+def _decode_call_request(raw: bytes) -> Dict[str, str]:
+    """Decode and check the three-string call payload without a Pydantic model"""
+    try:
+        body = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=422, detail="Request body must be valid JSON")
+    if not isinstance(body, dict):
+        raise HTTPException(status_code=422, detail="Request body must be an object")
+    for field in _CALL_REQUEST_FIELDS:
+        if not isinstance(body.get(field), str):
+            raise HTTPException(status_code=422, detail=f"'{field}' must be a string")
+    return body
 
 
 @app.post("/api/make-executive-call")
-async def make_executive_call(request: CallRequest):
+async def make_executive_call(request: Request):
     """Endpoint to initiate an AI Executive call"""
+    call = _decode_call_request(await request.body())
     try:
         result = await vapi_client.create_phone_call(
-            phone_number=request.phone_number,
+            phone_number=call["phone_number"],
             assistant_id="your-executive-assistant-id",
-            customer_name=request.customer_name,
+            customer_name=call["customer_name"],
             metadata={
-                "purpose": request.purpose,
-                "initiated_at": datetime.utcnow().isoformat(),
+                "purpose": call["purpose"],
+                "initiated_at": _utc_now_iso(),
             },
         )
         return {"success": True, "call_id": result["id"], "status": result["status"]}